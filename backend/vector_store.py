@@ -5,6 +5,7 @@ Hybrid Approach: HuggingFace Embeddings + Ollama LLM
 
 import os
 import logging
+import functools
 from typing import List, Dict, Any, Optional
 import faiss
 import numpy as np
@@ -33,16 +34,23 @@ class HuggingFaceEmbeddingsWrapper(Embeddings):
         print(f"[EMBEDDINGS] 🤗 Loading {model_name}")
         self.model = SentenceTransformer(model_name)
         print(f"[EMBEDDINGS] ✅ Ready")
+        # Repeated queries (common with retried or near-identical user
+        # stories) skip the transformer forward pass entirely
+        self._embed_query_cached = functools.lru_cache(maxsize=1024)(self._embed_query)
         
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
         """Embed a list of documents"""
         embeddings = self.model.encode(texts, convert_to_numpy=True)
         return embeddings.tolist()
     
-    def embed_query(self, text: str) -> List[float]:
-        """Embed a single query"""
+    def _embed_query(self, text: str) -> tuple:
+        """Embed a single query, returning a hashable tuple for caching"""
         embedding = self.model.encode([text], convert_to_numpy=True)
-        return embedding[0].tolist()
+        return tuple(embedding[0].tolist())
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a single query (LRU-cached on the exact query string)"""
+        return list(self._embed_query_cached(text))
 
 class TestCaseVectorStore:
     """
@@ -55,21 +63,32 @@ class TestCaseVectorStore:
                  embeddings_model: str = "all-MiniLM-L6-v2",
                  vector_store_path: str = "./vector_store",
                  chunk_size: int = 1000,
-                 chunk_overlap: int = 200):
+                 chunk_overlap: int = 200,
+                 ivf_threshold: int = 10000,
+                 nprobe: int = 8,
+                 use_gpu: bool = False):
         """
         Initialize the hybrid vector store
-        
+
         Args:
             knowledge_base_path: Path to knowledge base documents
             embeddings_model: HuggingFace model for embeddings
             vector_store_path: Path to save/load vector store
             chunk_size: Size of text chunks for processing
             chunk_overlap: Overlap between chunks
+            ivf_threshold: Chunk count above which the flat index is converted to IVF
+            nprobe: Number of IVF cells probed per query (recall/speed trade-off)
+            use_gpu: Clone the index to GPU for search when faiss-gpu is available
         """
         self.knowledge_base_path = knowledge_base_path
         self.vector_store_path = vector_store_path
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+        self.use_gpu = use_gpu
+        self._gpu_index = None
+        self._gpu_resources = None
         
         print(f"[VECTOR_STORE] 🚀 AI-ONLY Mode Ready")
         print(f"[VECTOR_STORE] 🤗 HuggingFace + 🦙 Ollama + ⚡ FAISS")
@@ -146,6 +165,11 @@ class TestCaseVectorStore:
                     allow_dangerous_deserialization=True
                 )
                 
+                # Apply query-time IVF tuning if a converted index was persisted
+                if hasattr(self.vector_store.index, 'nprobe'):
+                    self.vector_store.index.nprobe = self.nprobe
+                self._gpu_index = None
+
                 stats = self.get_stats()
                 print(f"[VECTOR_STORE] ✅ Loaded {stats['document_count']} documents")
                 logger.info(f"Loaded vector store with {stats['document_count']} documents")
@@ -187,7 +211,11 @@ class TestCaseVectorStore:
                 chunks,
                 self.embeddings
             )
-            
+
+            # At scale, swap the exhaustive flat index for a trained IVF index
+            self._maybe_convert_to_ivf()
+            self._gpu_index = None
+
             # Save vector store
             print(f"[VECTOR_STORE] 💾 Saving vector store...")
             self.vector_store.save_local(self.vector_store_path, index_name="index")
@@ -203,6 +231,65 @@ class TestCaseVectorStore:
             print(f"[VECTOR_STORE] ❌ Failed to create vector store: {str(e)}")
             return False
 
+    def _maybe_clone_to_gpu(self):
+        """
+        Return a GPU clone of the current index, or None when GPU search is
+        disabled or unavailable. The clone is cached and rebuilt lazily after
+        load/create invalidate it, so per-query cost is one attribute read.
+        """
+        if not self.use_gpu or not hasattr(faiss, 'StandardGpuResources'):
+            return None
+
+        if self._gpu_index is None and self.vector_store is not None:
+            try:
+                if self._gpu_resources is None:
+                    self._gpu_resources = faiss.StandardGpuResources()
+                self._gpu_index = faiss.index_cpu_to_gpu(
+                    self._gpu_resources, 0, self.vector_store.index)
+                logger.info("Cloned FAISS index to GPU for search")
+            except Exception as e:
+                # Fall back to CPU search permanently for this index
+                logger.warning(f"GPU clone failed, searching on CPU: {str(e)}")
+                self.use_gpu = False
+                return None
+
+        return self._gpu_index
+
+    def _maybe_convert_to_ivf(self) -> None:
+        """
+        Replace the default flat (exhaustive O(N*d)) FAISS index with a trained
+        IndexIVFFlat once the chunk count crosses ivf_threshold. IVF probes only
+        nprobe cells per query, giving a 10-100x speedup with minimal recall
+        loss. Vectors are re-added in their original order so the LangChain
+        docstore id mapping stays valid.
+        """
+        if not self.vector_store:
+            return
+
+        try:
+            index = self.vector_store.index
+            n = index.ntotal
+            if n < self.ivf_threshold or not isinstance(index, faiss.IndexFlat):
+                return
+
+            d = index.d
+            vectors = index.reconstruct_n(0, n)
+            nlist = max(1, int(np.sqrt(n)))
+
+            quantizer = faiss.IndexFlatL2(d)
+            ivf_index = faiss.IndexIVFFlat(quantizer, d, nlist)
+            ivf_index.train(vectors)
+            ivf_index.add(vectors)
+            ivf_index.nprobe = self.nprobe
+
+            self.vector_store.index = ivf_index
+            print(f"[VECTOR_STORE] ⚡ Converted flat index to IVF (nlist={nlist}, nprobe={self.nprobe})")
+            logger.info(f"Converted flat index to IVF with nlist={nlist}, nprobe={self.nprobe} for {n} vectors")
+
+        except Exception as e:
+            # Keep the flat index on any conversion failure - search stays correct
+            logger.warning(f"IVF conversion skipped, keeping flat index: {str(e)}")
+
     def _load_documents(self) -> List[Document]:
         """
         Load documents from knowledge base directory
@@ -263,6 +350,74 @@ class TestCaseVectorStore:
             logger.error(f"Error in similarity search: {str(e)}")
             return []
 
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4) -> List[Document]:
+        """
+        Perform similarity search with a precomputed query embedding
+
+        Args:
+            embedding: Precomputed query embedding vector
+            k: Number of results to return
+
+        Returns:
+            List of similar documents
+        """
+        if not self.vector_store:
+            logger.warning("Vector store not initialized")
+            return []
+
+        try:
+            results = self.vector_store.similarity_search_by_vector(embedding, k=k)
+            logger.info(f"Found {len(results)} similar documents for precomputed embedding")
+            return results
+        except Exception as e:
+            logger.error(f"Error in similarity search by vector: {str(e)}")
+            return []
+
+    def similarity_search_by_vectors(self, embeddings: List[List[float]], k: int = 4) -> List[List[Document]]:
+        """
+        Perform similarity search for a batch of precomputed query embeddings
+
+        All queries are scored against the index in a single stacked
+        faiss search call instead of one call per query.
+
+        Args:
+            embeddings: Precomputed query embedding vectors
+            k: Number of results to return per query
+
+        Returns:
+            One list of similar documents per query
+        """
+        if not self.vector_store:
+            logger.warning("Vector store not initialized")
+            return [[] for _ in embeddings]
+
+        if not embeddings:
+            return []
+
+        try:
+            queries = np.ascontiguousarray(np.asarray(embeddings, dtype=np.float32))
+            # Stacked batches amortize the host-device transfer, so the GPU
+            # clone pays off here even for modest batch sizes
+            index = self._maybe_clone_to_gpu() or self.vector_store.index
+            _, indices = index.search(queries, k)
+
+            results = []
+            for row in indices:
+                docs = []
+                for idx in row:
+                    if idx == -1:
+                        continue
+                    docstore_id = self.vector_store.index_to_docstore_id[idx]
+                    doc = self.vector_store.docstore.search(docstore_id)
+                    if isinstance(doc, Document):
+                        docs.append(doc)
+                results.append(docs)
+            logger.info(f"Batched similarity search over {len(embeddings)} queries")
+            return results
+        except Exception as e:
+            logger.error(f"Error in batched similarity search: {str(e)}")
+            return [[] for _ in embeddings]
+
     def similarity_search_with_score(self, query: str, k: int = 4) -> List[tuple]:
         """
         Perform similarity search with scores
@@ -286,23 +441,27 @@ class TestCaseVectorStore:
             logger.error(f"Error in similarity search with score: {str(e)}")
             return []
 
-    def get_relevant_context(self, query: str, max_tokens: int = 1000) -> str:
+    def get_relevant_context(self, query: str, max_tokens: int = 1000, embedding: Optional[List[float]] = None) -> str:
         """
         Get relevant context for a query using HuggingFace semantic search
-        
+
         Args:
             query: Search query
             max_tokens: Maximum tokens to return
-            
+            embedding: Optional precomputed embedding for the query (skips re-encoding)
+
         Returns:
             Relevant context string
         """
         if not self.vector_store:
             return "No relevant context found."
-        
+
         try:
-            # Get similar documents
-            docs = self.similarity_search(query, k=3)
+            # Get similar documents (reuse the precomputed embedding when provided)
+            if embedding is not None:
+                docs = self.similarity_search_by_vector(embedding, k=3)
+            else:
+                docs = self.similarity_search(query, k=3)
             
             if not docs:
                 return "No relevant context found."
@@ -0,0 +1,52 @@
+"""
+Gunicorn configuration for the test case generation API
+
+Run with: gunicorn -c gunicorn.conf.py src.web.app:app
+"""
+import os
+
+# Load the app (and build the generator, via PRELOAD_WARMUP below) in the
+# master before fork(), so every worker shares the read-only model and
+# index pages copy-on-write: N workers cost ~1x the model RAM, not Nx.
+# Requires the app to run without debug/reloader, which is the default
+# outside the __main__ block.
+preload_app = True
+os.environ.setdefault('PRELOAD_WARMUP', '1')
+
+# Threaded workers with keep-alive: requests spend seconds blocked on the
+# LLM, so threads multiplex that wait, and persistent connections spare
+# clients a TCP handshake per poll (and the host TIME_WAIT churn).
+worker_class = 'gthread'
+threads = 4
+keepalive = 75
+
+# One worker per core behind a SO_REUSEPORT listen socket: the kernel
+# load-balances accepted connections across workers, so throughput for
+# this stateless service scales roughly linearly with cores.
+bind = '0.0.0.0:5002'
+workers = os.cpu_count() or 1
+reuse_port = True
+
+# Heartbeat files on tmpfs: keeps the worker liveness writes off disk
+# (and off any network-backed filesystem, where they can stall workers)
+worker_tmp_dir = '/dev/shm'
+
+
+def post_worker_init(worker):
+    """Warm the generator once per worker, outside the request path
+    
+    A no-op when preload already built it in the master (the populated
+    cache is inherited through fork); kept as a safety net for runs
+    without --preload.
+    """
+    from src.web.app import get_generator
+    get_generator()
+    
+    # Pin each worker to its own core so its working set stays in that
+    # core's caches instead of migrating between them
+    if hasattr(os, 'sched_setaffinity'):
+        try:
+            cpus = sorted(os.sched_getaffinity(0))
+            os.sched_setaffinity(0, {cpus[worker.age % len(cpus)]})
+        except OSError:
+            pass
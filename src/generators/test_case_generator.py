@@ -1,38 +1,308 @@
 import os
 import re
+import sys
+import json
+import hashlib
+import functools
 import logging
+from collections import OrderedDict
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+
+# Optional disk-backed completion cache; purely in-memory when not installed
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+# Ensure the project root is importable once at module load, not per instance
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.append(_PROJECT_ROOT)
+
+# get_vector_store memoizes one TestCaseVectorStore per project, so every
+# TestCaseGenerator for the same project shares a single FAISS handle
+from backend.vector_store import get_vector_store
+
+from langchain_core.prompts import PromptTemplate
+
+# Optional jinja2 compiled templates: rendering compiled template bytecode
+# beats re-formatting multi-KB strings on every chunk. PromptTemplate.format
+# remains the fallback when jinja2 is not installed.
+try:
+    import jinja2
+    _JINJA_ENV = jinja2.Environment()
+except ImportError:
+    jinja2 = None
+    _JINJA_ENV = None
+
+def _compile_template(template: str):
+    """Compile a .format-style template string into a jinja2 template"""
+    if _JINJA_ENV is None:
+        return None
+    # Protect {{ }} escapes, promote {var} placeholders, restore literals
+    source = template.replace('{{', '\x00').replace('}}', '\x01')
+    source = re.sub(r'\{(\w+)\}', r'{{ \1 }}', source)
+    source = source.replace('\x00', '{').replace('\x01', '}')
+    return _JINJA_ENV.from_string(source)
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Ollama verification probes (server list + "Hello" invoke) are expensive for
+# services that build a generator per request, so run them once per
+# (base_url, model) and share the constructed OllamaLLM, which is stateless
+_LLM_VERIFIED: set = set()
+_LLM_INSTANCES: Dict[Tuple[str, ...], Any] = {}
+
 # Constants for prompt size management
 MAX_PROMPT_TOKENS = 2048  # Example, adjust to model's actual max
 SAFE_PROMPT_TOKENS = int(MAX_PROMPT_TOKENS * 0.75)
 
+# Completion cache: identical prompts (CI reruns, retry flows) skip the LLM
+# entirely. In-memory LRU first, then an optional diskcache layer that
+# survives process restarts.
+_COMPLETION_CACHE: OrderedDict = OrderedDict()
+_COMPLETION_CACHE_MAX = 128
+_DISK_CACHE = None
+
+def _get_disk_cache():
+    """Lazily open the persistent completion cache, if diskcache is installed"""
+    global _DISK_CACHE
+    if diskcache is not None and _DISK_CACHE is None:
+        try:
+            _DISK_CACHE = diskcache.Cache(os.path.join(_PROJECT_ROOT, 'backend', 'llm_cache'))
+        except Exception as e:
+            logger.warning(f"Could not open disk completion cache: {str(e)}")
+    return _DISK_CACHE
+
+def _completion_cache_key(model: str, llm_format: str, prompt: str) -> str:
+    """Hash of the prompt after whitespace/case normalization, plus model id"""
+    normalized = ' '.join(prompt.lower().split())
+    digest = hashlib.blake2b(normalized.encode('utf-8'), digest_size=16).hexdigest()
+    return f"{model}|{llm_format}|{digest}"
+
+def _completion_cache_get(key: str) -> Optional[str]:
+    """Look up a cached completion, promoting memory hits and disk hits"""
+    if key in _COMPLETION_CACHE:
+        _COMPLETION_CACHE.move_to_end(key)
+        return _COMPLETION_CACHE[key]
+    disk = _get_disk_cache()
+    if disk is not None:
+        try:
+            value = disk.get(key)
+        except Exception:
+            value = None
+        if value is not None:
+            _completion_cache_put(key, value, write_disk=False)
+            return value
+    return None
+
+def _completion_cache_put(key: str, value: str, write_disk: bool = True) -> None:
+    """Store a completion in the LRU (and on disk when available)"""
+    _COMPLETION_CACHE[key] = value
+    _COMPLETION_CACHE.move_to_end(key)
+    while len(_COMPLETION_CACHE) > _COMPLETION_CACHE_MAX:
+        _COMPLETION_CACHE.popitem(last=False)
+    if write_disk:
+        disk = _get_disk_cache()
+        if disk is not None:
+            try:
+                disk.set(key, value)
+            except Exception:
+                pass
+
+@functools.lru_cache(maxsize=128)
+def _enumerate_criteria_cached(ac_text: str, use_nlp: bool) -> tuple:
+    """
+    Parse acceptance criteria text into atomic requirements. Cached on the raw
+    input so iterative UIs that regenerate with the same criteria avoid repeat
+    spaCy parses; returns an immutable tuple for hashability.
+    """
+    if use_nlp:
+        try:
+            import spacy
+            nlp = spacy.load("en_core_web_sm")
+            doc = nlp(ac_text)
+            items = []
+            for sent in doc.sents:
+                # Only split on conjunctions if sentence is compound and both sides are complete clauses
+                if any(tok.dep_ == "cc" for tok in sent):
+                    # Try to split only if both sides have a verb
+                    clauses = [clause.text.strip() for clause in sent._.clauses] if hasattr(sent, "_.clauses") else [sent.text.strip()]
+                    items.extend([cl for cl in clauses if cl])
+                else:
+                    items.append(sent.text.strip())
+            # Remove empty items
+            return tuple(item for item in items if item)
+        except Exception as e:
+            logger.warning(f"spaCy NLP parsing failed, falling back to regex: {str(e)}")
+    # Fallback: regex-based splitting
+    items = []
+    numbered = re.split(r'\d+\.', ac_text)
+    if len(numbered) > 1:
+        if not numbered[0].strip():
+            numbered = numbered[1:]
+        items = [item.strip() for item in numbered if item.strip()]
+    else:
+        bullet_split = re.split(r'[\*\-•]', ac_text)
+        if len(bullet_split) > 1:
+            if not bullet_split[0].strip():
+                bullet_split = bullet_split[1:]
+            items = [item.strip() for item in bullet_split if item.strip()]
+        else:
+            lines = [line.strip() for line in ac_text.split('\n') if line.strip()]
+            for line in lines:
+                atomic = re.split(r'\band\b|\bor\b|;|\.', line)
+                items.extend([a.strip() for a in atomic if a.strip()])
+    return tuple(items)
+
+# Static instructions + per-request context (rendered once per request)
+_PROMPT_PREFIX = PromptTemplate(
+    input_variables=[
+        "domain_knowledge",
+        "similar_examples",
+    ],
+    template="""
+You are a senior test engineer. Based on the user story and acceptance criteria, produce clear and readable test cases with the EXACT fields and order below:
+
+Fields per test case (no extra fields):
+- Acceptance Criteria
+- Test case Title
+- Steps
+- Expected Result
+
+Important formatting and ordering rules:
+- Output must be in Markdown.
+- First, provide ALL Positive test cases for ALL acceptance criteria.
+- Then, after finishing positives, provide ALL Negative test cases for ALL acceptance criteria.
+- Group by Acceptance Criterion inside each section and ensure complete coverage.
+- Use concise, numbered Steps for clarity.
+- Keep Expected Result singular and specific.
+
+Additional domain knowledge and example references (use for context only, do not copy verbatim):
+{domain_knowledge}
+
+{similar_examples}
+"""
+)
+# Per-chunk criteria section + output-format block (rendered per chunk)
+_PROMPT_SUFFIX = PromptTemplate(
+    input_variables=[
+        "criteria_list",
+        "criteria_count",
+        "previous_criteria",
+    ],
+    template="""
+Acceptance Criteria to cover ({criteria_count} items):
+
+{criteria_list}
+
+Context from previous criteria (for cross-criterion awareness):
+{previous_criteria}
+
+Now generate the test cases in this structure (follow EXACT casing and labels; no leading dashes on labels):
+
+## Positive Test Cases
+
+Acceptance Criteria: <paste the AC text>
+Test case Title: Verify <concise, outcome-focused title>
+Steps:
+    1. <step>
+    2. <step>
+Expected Result: <singular expected outcome>
+
+Acceptance Criteria: <paste the AC text>
+Test case Title: Verify <concise, outcome-focused title>
+Steps:
+    1. <step>
+    2. <step>
+Expected Result: <singular expected outcome>
+
+...repeat until all ACs have at least one Positive test case…
+
+## Negative Test Cases (Do not include the Acceptance Criteria line in this section)
+
+Test case Title: Validate <concise, failure-mode-focused title>
+Steps:
+    1. <step>
+    2. <step>
+Expected Result: <singular expected outcome>
+
+Test case Title: Validate <concise, failure-mode-focused title>
+Steps:
+    1. <step>
+    2. <step>
+Expected Result: <singular expected outcome>
+
+Do not include any other fields. Keep wording grounded in the given acceptance criteria.
+"""
+)
+# JSON-mode suffix: same criteria context, but the model returns a
+# structured suite instead of Markdown so no regex parsing is needed
+_PROMPT_SUFFIX_JSON = PromptTemplate(
+    input_variables=[
+        "criteria_list",
+        "criteria_count",
+        "previous_criteria",
+    ],
+    template="""
+Acceptance Criteria to cover ({criteria_count} items):
+
+{criteria_list}
+
+Context from previous criteria (for cross-criterion awareness):
+{previous_criteria}
+
+Respond with ONLY a JSON object in exactly this shape (no Markdown, no commentary):
+
+{{"positive": [{{"acceptance_criteria": "<paste the AC text>", "title": "Verify <concise, outcome-focused title>", "steps": ["<step>", "<step>"], "expected_result": "<singular expected outcome>"}}], "negative": [{{"title": "Validate <concise, failure-mode-focused title>", "steps": ["<step>", "<step>"], "expected_result": "<singular expected outcome>"}}]}}
+
+Every acceptance criterion must have at least one positive entry. Negative entries omit acceptance_criteria. Keep wording grounded in the given acceptance criteria.
+"""
+)
+
+_PROMPT_PREFIX_COMPILED = _compile_template(_PROMPT_PREFIX.template)
+_PROMPT_SUFFIX_COMPILED = _compile_template(_PROMPT_SUFFIX.template)
+_PROMPT_SUFFIX_JSON_COMPILED = _compile_template(_PROMPT_SUFFIX_JSON.template)
+
 class TestCaseGenerator:
     """
     Enhanced test case generator with FAISS vector store integration
     Generate test cases from user stories and acceptance criteria using AI-first approach
     """
     
-    def __init__(self, retriever=None, llm=None, ai_only=True, model_name=None, project_name: str = None, project_id: str = None):
+    def __init__(self, retriever=None, llm=None, ai_only=True, model_name=None, project_name: str = None, project_id: str = None,
+                 num_ctx: int = None, num_batch: int = None, num_gpu: int = None, json_output: bool = True):
         """
         Initialize the enhanced test case generator with AI-ONLY approach
-        
+
         Args:
             retriever: Retriever for similar test cases (deprecated)
             llm: Language model for test case generation
             ai_only: If True (default), only use AI components, fail if not available
+            model_name: Ollama model tag; quantized variants such as
+                "llama2:7b-chat-q4_K_M" give 2-3x token throughput on this
+                memory-bound workload (pull via `ollama pull <tag>` first)
             project_name: Optional project name to select per-project vector store
             project_id: Deprecated alias for project_name (kept for backward compatibility)
+            num_ctx: Optional Ollama context window size override
+            num_batch: Optional Ollama prompt-eval batch size override
+            num_gpu: Optional number of model layers to offload to GPU
+            json_output: If True (default), request structured JSON from the
+                LLM via Ollama's JSON mode and render Markdown from the parsed
+                suite, skipping the regex post-processor; the regex path is
+                kept as a fallback when JSON parsing fails
         """
         self.retriever = retriever
         self.ai_mode = "unknown"
         self.ai_only = ai_only
         self.initialization_error = None
         self.model_name = model_name
+        self.num_ctx = num_ctx
+        self.num_batch = num_batch
+        self.num_gpu = num_gpu
+        self.json_output = json_output
         # Normalize project identifier
         self.project_name = project_name or project_id
         # Back-compat attribute
@@ -60,16 +330,11 @@ class TestCaseGenerator:
         Initialize AI components (Ollama LLM + FAISS Vector Store)
         Sets ai_mode to 'ai' if successful, stores error if failed
         """
+        self._llm_provided = provided_llm is not None
         try:
             # Step 1: Initialize and verify FAISS vector store
             logger.info("🔍 Initializing FAISS vector store...")
             
-            # Import vector store from backend package (ensure project root is on sys.path)
-            import sys
-            project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-            if project_root not in sys.path:
-                sys.path.append(project_root)
-            from backend.vector_store import get_vector_store
             # Vector store API expects project_name; we pass normalized self.project_name
             self.vector_store = get_vector_store(project_name=self.project_name)
             
@@ -90,31 +355,56 @@ class TestCaseGenerator:
             if provided_llm is None:
                 from langchain_ollama import OllamaLLM
                 import ollama
-                
-                # Verify Ollama server is running
-                try:
-                    models_response = ollama.list()
-                    # Handle new Ollama API format
-                    if hasattr(models_response, 'models'):
-                        available_models = [model.model for model in models_response.models]
-                    else:
-                        # Fallback for older API format
-                        available_models = [model.get('name', model.get('model', '')) for model in models_response.get('models', [])]
-                    
-                    if not any('llama2' in model for model in available_models):
-                        raise RuntimeError("llama2 model not found. Please run: ollama pull llama2")
-                    self.llm = OllamaLLM(model="llama2", base_url="http://localhost:11434", temperature=0.1)
-                    
-                    # Test LLM with a simple query
-                    test_response = self.llm.invoke("Hello")
-                    if not test_response or len(test_response.strip()) == 0:
-                        raise RuntimeError("LLM test query returned empty response")
-                        
-                    logger.info("✅ Ollama LLM verified and operational")
-                    
-                except Exception as ollama_error:
-                    raise RuntimeError(f"Ollama verification failed: {str(ollama_error)}")
-                    
+
+                base_url = "http://localhost:11434"
+                model = self.model_name or "llama2"
+                llm_format = "json" if self.json_output else ""
+                llm_key = (base_url, model, llm_format)
+
+                if llm_key in _LLM_VERIFIED and llm_key in _LLM_INSTANCES:
+                    # Already verified in this process - reuse the shared instance
+                    self.llm = _LLM_INSTANCES[llm_key]
+                    logger.info("✅ Reusing verified Ollama LLM instance")
+                else:
+                    # Verify Ollama server is running (once per base_url+model)
+                    try:
+                        models_response = ollama.list()
+                        # Handle new Ollama API format
+                        if hasattr(models_response, 'models'):
+                            available_models = [m.model for m in models_response.models]
+                        else:
+                            # Fallback for older API format
+                            available_models = [m.get('name', m.get('model', '')) for m in models_response.get('models', [])]
+
+                        # Match on the base model name so quantized tags
+                        # (e.g. llama2:7b-chat-q4_K_M) resolve correctly
+                        base_model = model.split(':', 1)[0]
+                        if not any(base_model in m for m in available_models):
+                            raise RuntimeError(f"{model} model not found. Please run: ollama pull {model}")
+
+                        llm_kwargs = {"model": model, "base_url": base_url, "temperature": 0.1}
+                        if llm_format:
+                            llm_kwargs["format"] = llm_format
+                        if self.num_ctx is not None:
+                            llm_kwargs["num_ctx"] = self.num_ctx
+                        if self.num_batch is not None:
+                            llm_kwargs["num_batch"] = self.num_batch
+                        if self.num_gpu is not None:
+                            llm_kwargs["num_gpu"] = self.num_gpu
+                        self.llm = OllamaLLM(**llm_kwargs)
+
+                        # Test LLM with a simple query
+                        test_response = self.llm.invoke("Hello")
+                        if not test_response or len(test_response.strip()) == 0:
+                            raise RuntimeError("LLM test query returned empty response")
+
+                        _LLM_INSTANCES[llm_key] = self.llm
+                        _LLM_VERIFIED.add(llm_key)
+                        logger.info("✅ Ollama LLM verified and operational")
+
+                    except Exception as ollama_error:
+                        raise RuntimeError(f"Ollama verification failed: {str(ollama_error)}")
+
             else:
                 self.llm = provided_llm
                 logger.info(f"✅ Using provided LLM: {type(provided_llm).__name__}")
@@ -142,98 +432,28 @@ class TestCaseGenerator:
 
     def _initialize_prompt_template(self):
         """
-        Initialize the AI-only prompt template with HuggingFace context support
+        Initialize the AI-only prompt templates with HuggingFace context support.
+
+        The prompt is split into a prefix (instructions + per-request context,
+        identical across criteria chunks) and a thin per-chunk suffix. The
+        prefix is rendered once per request and reused, so only the small
+        suffix is re-rendered per chunk; keeping the static text first also
+        pairs well with Ollama prompt caching.
         """
-        from langchain_core.prompts import PromptTemplate
         if self.ai_mode == "ai":
-            # Updated prompt to enforce requested output format and ordering for readability
-            self.prompt = PromptTemplate(
-                input_variables=[
-                    "user_story",
-                    "acceptance_criteria",
-                    "domain_knowledge",
-                    "similar_examples",
-                    "criteria_list",
-                    "criteria_count",
-                    "previous_criteria",
-                ],
-                template="""
-You are a senior test engineer. Based on the user story and acceptance criteria, produce clear and readable test cases with the EXACT fields and order below:
-
-Fields per test case (no extra fields):
-- Acceptance Criteria
-- Test case Title
-- Steps
-- Expected Result
-
-Important formatting and ordering rules:
-- Output must be in Markdown.
-- First, provide ALL Positive test cases for ALL acceptance criteria.
-- Then, after finishing positives, provide ALL Negative test cases for ALL acceptance criteria.
-- Group by Acceptance Criterion inside each section and ensure complete coverage.
-- Use concise, numbered Steps for clarity.
-- Keep Expected Result singular and specific.
-
-Acceptance Criteria to cover ({criteria_count} items):
-
-{criteria_list}
-
-Context from previous criteria (for cross-criterion awareness):
-{previous_criteria}
-
-Additional domain knowledge and example references (use for context only, do not copy verbatim):
-{domain_knowledge}
-
-{similar_examples}
-
-Now generate the test cases in this structure (follow EXACT casing and labels; no leading dashes on labels):
-
-## Positive Test Cases
-
-Acceptance Criteria: <paste the AC text>
-Test case Title: Verify <concise, outcome-focused title>
-Steps:
-    1. <step>
-    2. <step>
-Expected Result: <singular expected outcome>
-
-Acceptance Criteria: <paste the AC text>
-Test case Title: Verify <concise, outcome-focused title>
-Steps:
-    1. <step>
-    2. <step>
-Expected Result: <singular expected outcome>
-
-...repeat until all ACs have at least one Positive test case…
-
-## Negative Test Cases (Do not include the Acceptance Criteria line in this section)
-
-Test case Title: Validate <concise, failure-mode-focused title>
-Steps:
-    1. <step>
-    2. <step>
-Expected Result: <singular expected outcome>
-
-Test case Title: Validate <concise, failure-mode-focused title>
-Steps:
-    1. <step>
-    2. <step>
-Expected Result: <singular expected outcome>
-
-Do not include any other fields. Keep wording grounded in the given acceptance criteria.
-"""
-            )
-            # Create runnable chain for AI mode
+            self.prompt_prefix = _PROMPT_PREFIX
+            self.prompt_suffix = _PROMPT_SUFFIX
+            self.prompt_suffix_json = _PROMPT_SUFFIX_JSON
             if self.llm:
-                self.chain = self.prompt | self.llm
-                logger.info("✅ Prompt template initialized with requested format and ordering")
+                logger.info("✅ Prompt templates initialized with requested format and ordering")
             else:
-                logger.error("❌ Cannot create chain: LLM not available")
+                logger.error("❌ Prompt templates ready but LLM not available")
         else:
             # AI mode failed - no prompt template in AI-only mode
             logger.error("❌ AI-only mode: Cannot initialize prompt template without AI components")
-            self.prompt = None
-            self.chain = None
+            self.prompt_prefix = None
+            self.prompt_suffix = None
+            self.prompt_suffix_json = None
 
     def _summarize_text(self, text: str) -> str:
         """
@@ -263,54 +483,18 @@ Do not include any other fields. Keep wording grounded in the given acceptance c
         If manual_override is provided, use it directly.
         If use_nlp is True, use spaCy for sentence segmentation and conjunction detection.
         Otherwise, fallback to regex-based splitting.
+        Results are cached per (ac_text, use_nlp) so regenerations with the
+        same criteria skip the spaCy parse.
         """
         if manual_override:
             return manual_override
-        if use_nlp:
-            try:
-                import spacy
-                nlp = spacy.load("en_core_web_sm")
-                doc = nlp(ac_text)
-                items = []
-                for sent in doc.sents:
-                    # Only split on conjunctions if sentence is compound and both sides are complete clauses
-                    if any(tok.dep_ == "cc" for tok in sent):
-                        # Try to split only if both sides have a verb
-                        clauses = [clause.text.strip() for clause in sent._.clauses] if hasattr(sent, "_.clauses") else [sent.text.strip()]
-                        items.extend([cl for cl in clauses if cl])
-                    else:
-                        items.append(sent.text.strip())
-                # Remove empty items
-                return [item for item in items if item]
-            except Exception as e:
-                logger.warning(f"spaCy NLP parsing failed, falling back to regex: {str(e)}")
-        # Fallback: regex-based splitting
-        import re
-        items = []
-        numbered = re.split(r'\d+\.', ac_text)
-        if len(numbered) > 1:
-            if not numbered[0].strip():
-                numbered = numbered[1:]
-            items = [item.strip() for item in numbered if item.strip()]
-        else:
-            bullet_split = re.split(r'[\*\-•]', ac_text)
-            if len(bullet_split) > 1:
-                if not bullet_split[0].strip():
-                    bullet_split = bullet_split[1:]
-                items = [item.strip() for item in bullet_split if item.strip()]
-            else:
-                lines = [line.strip() for line in ac_text.split('\n') if line.strip()]
-                for line in lines:
-                    atomic = re.split(r'\band\b|\bor\b|;|\.', line)
-                    items.extend([a.strip() for a in atomic if a.strip()])
-        return items
+        return list(_enumerate_criteria_cached(ac_text, use_nlp))
 
     def extract_test_cases(self, output):
         """
         Extract test cases from output using flexible regex.
         Returns a list of test case blocks.
         """
-        import re
         # Flexible pattern: looks for 'Test Case', 'Title:', and 'Steps:' in proximity
         pattern = re.compile(r'(Test Case \d+.*?Title:.*?Steps:.*?Expected Results:.*?)(?=Test Case \d+|$)', re.DOTALL | re.IGNORECASE)
         return pattern.findall(output)
@@ -322,8 +506,6 @@ Do not include any other fields. Keep wording grounded in the given acceptance c
         - Fields: Acceptance Criteria, Test case Title, Steps, Expected Result
         Returns formatted Markdown if parsing succeeds; otherwise returns raw_text.
         """
-        import re
-
         def parse(text):
             cases = {"positive": [], "negative": []}
             section = None
@@ -342,10 +524,20 @@ Do not include any other fields. Keep wording grounded in the given acceptance c
                 # For Negative section, require steps or expected (avoid empty shells)
                 # For Positive, allow AC text-only to be formatted, but prefer some content
                 return has_steps or has_expected or has_title or has_ac_text
-            lines = text.splitlines()
-            i = 0
-            while i < len(lines):
-                line = lines[i].strip()
+            # Single forward pass over a line iterator with a one-line pushback
+            # buffer (needed when the steps consumer hits the next field
+            # marker), avoiding the indexed list walk over the full output
+            lines = iter(text.splitlines())
+            pushback = None
+            while True:
+                if pushback is not None:
+                    raw_line = pushback
+                    pushback = None
+                else:
+                    raw_line = next(lines, None)
+                    if raw_line is None:
+                        break
+                line = raw_line.strip()
                 low = line.lower()
                 # Section headers
                 if re.match(r"^##\s*positive\s*test\s*cases.*$", low, flags=re.IGNORECASE):
@@ -354,7 +546,6 @@ Do not include any other fields. Keep wording grounded in the given acceptance c
                     if current and is_meaningful(current):
                         cases[section].append(current)
                     current = None
-                    i += 1
                     continue
                 if re.match(r"^##\s*negative\s*test\s*cases.*$", low, flags=re.IGNORECASE):
                     section = "negative"
@@ -362,7 +553,6 @@ Do not include any other fields. Keep wording grounded in the given acceptance c
                     if current and is_meaningful(current):
                         cases[section].append(current)
                     current = None
-                    i += 1
                     continue
                 # AC heading (optional)
                 m = re.match(r"^###\s*AC\s*(\d+)\b.*$", line, flags=re.IGNORECASE)
@@ -373,7 +563,6 @@ Do not include any other fields. Keep wording grounded in the given acceptance c
                     current = {"ac": ac_num, "ac_text": None, "title": None, "steps": [], "expected": None}
                     # Reset implicit index tracker to align with explicit AC
                     implicit_ac_index[section] = ac_num
-                    i += 1
                     continue
                 # If within a section but no current test started, start one implicitly by AC order
                 if section in ("positive", "negative") and current is None:
@@ -385,25 +574,26 @@ Do not include any other fields. Keep wording grounded in the given acceptance c
                 if current is not None:
                     if re.match(r"^-?\s*acceptance\s*criteria:", low):
                         current["ac_text"] = line.split(":", 1)[1].strip()
-                        i += 1
                         continue
                     if re.match(r"^-?\s*test\s*case\s*title:", low) or re.match(r"^-?\s*testcase\s*title:", low):
                         current["title"] = line.split(":", 1)[1].strip()
-                        i += 1
                         continue
                     if re.match(r"^-?\s*steps:", low):
-                        i += 1
-                        while i < len(lines):
-                            step_line = lines[i]
+                        # Consume step lines until the next field/heading marker,
+                        # which is pushed back for the outer loop to handle
+                        while True:
+                            step_line = next(lines, None)
+                            if step_line is None:
+                                break
                             step_stripped = step_line.strip()
                             low_step = step_stripped.lower()
                             if re.match(r"^(###|##)\s*", step_stripped) or re.match(r"^-?\s*expected\s*result:", low_step) or re.match(r"^-?\s*acceptance\s*criteria:", low_step) or re.match(r"^-?\s*test\s*case\s*title:", low_step) or re.match(r"^-?\s*testcase\s*title:", low_step):
+                                pushback = step_line
                                 break
                             if re.match(r"^\s*\d+\.\s*", step_stripped) or re.match(r"^\s*-\s+", step_stripped):
                                 step_val = re.sub(r"^\s*(\d+\.\s*|-\s+)", "", step_stripped).strip()
                                 if step_val:
                                     current["steps"].append(step_val)
-                            i += 1
                         continue
                     if re.match(r"^-?\s*expected\s*result:", low):
                         current["expected"] = line.split(":", 1)[1].strip()
@@ -411,9 +601,7 @@ Do not include any other fields. Keep wording grounded in the given acceptance c
                         if is_meaningful(current):
                             cases[section].append(current)
                         current = None
-                        i += 1
                         continue
-                i += 1
             # push last if not already pushed
             if current and section in ("positive", "negative") and is_meaningful(current):
                 cases[section].append(current)
@@ -489,6 +677,70 @@ Do not include any other fields. Keep wording grounded in the given acceptance c
         except Exception:
             return raw_text
 
+    def _retrieve_context(self, description: str, acceptance_criteria: str, use_knowledge: bool) -> Tuple[str, str]:
+        """
+        Retrieve domain knowledge and similar examples from the FAISS vector
+        store for a generation request. Both queries are encoded in a single
+        batched forward pass so the sentence-transformer runs once instead of
+        twice per request.
+
+        Returns:
+            Tuple of (domain_knowledge, similar_examples) strings
+        """
+        domain_knowledge = ""
+        similar_examples = ""
+
+        if use_knowledge and hasattr(self, 'vector_store') and self.vector_store:
+            try:
+                # One query per acceptance-criteria bullet gives per-bullet
+                # recall that a single combined query misses
+                bullets = [b.strip() for b in re.split(r'(?m)^\s*[-*\d.]+\s+', acceptance_criteria) if b.strip()]
+                query_ctx = f"{description}\n{acceptance_criteria}"
+                query_examples = f"test cases examples for {description}"
+                queries = [query_ctx, query_examples] + bullets
+                query_vecs = self.vector_store.embeddings.embed_documents(queries)
+
+                # Score all queries against the index in one batched search,
+                # then deduplicate before building the context block
+                doc_lists = self.vector_store.similarity_search_by_vectors(
+                    [query_vecs[0]] + query_vecs[2:], k=2
+                )
+                seen = set()
+                context_parts = []
+                current_tokens = 0
+                for docs in doc_lists:
+                    for doc in docs:
+                        dedup_key = (doc.metadata.get('filename'), doc.page_content[:80])
+                        if dedup_key in seen:
+                            continue
+                        seen.add(dedup_key)
+                        content_tokens = len(doc.page_content) // 4
+                        if current_tokens + content_tokens > 1000:
+                            continue
+                        context_parts.append(
+                            f"From {doc.metadata.get('filename', 'knowledge base')}:\n{doc.page_content}"
+                        )
+                        current_tokens += content_tokens
+                domain_knowledge = "\n\n---\n\n".join(context_parts)
+
+                # Get similar test case examples
+                similar_docs = self.vector_store.similarity_search_by_vector(query_vecs[1], k=3)
+
+                if similar_docs:
+                    similar_examples = "\n---\n".join([
+                        f"Example from {doc.metadata.get('filename', 'knowledge base')}:\n{doc.page_content[:500]}..."
+                        for doc in similar_docs
+                    ])
+
+                logger.info("[AI] 🤗 Using semantic search")
+
+            except Exception as e:
+                logger.error(f"❌ FAISS vector store failed: {str(e)}")
+                # In AI-only mode, we don't fallback - we fail
+                raise RuntimeError(f"AI-only mode: FAISS vector store failed: {str(e)}")
+
+        return domain_knowledge, similar_examples
+
     def generate_test_cases(self, description: str, acceptance_criteria: str, use_knowledge: bool = True) -> str:
         """
         Generate test cases using AI-ONLY approach with HuggingFace embeddings + Ollama LLM
@@ -513,64 +765,187 @@ Do not include any other fields. Keep wording grounded in the given acceptance c
         if not self.llm:
             raise RuntimeError("Ollama LLM is not initialized. Cannot generate test cases.")
 
+        ac_items = self.enumerate_criteria(acceptance_criteria)
+
         # Get enhanced context using FAISS vector store with HuggingFace embeddings
-        domain_knowledge = ""
-        similar_examples = ""
+        domain_knowledge, similar_examples = self._retrieve_context(description, acceptance_criteria, use_knowledge)
 
-        if use_knowledge and hasattr(self, 'vector_store') and self.vector_store:
+        all_outputs = []
+        for chunk_output in self._iter_chunk_outputs(description, ac_items, domain_knowledge, similar_examples):
+            all_outputs.append(chunk_output)
+
+        # Preferred path: parse the structured JSON suite and render Markdown
+        # deterministically, skipping the regex post-processor entirely
+        if self.json_output:
+            suite = {"positive": [], "negative": []}
+            parsed_ok = True
+            for output in all_outputs:
+                chunk_suite = self._parse_suite_json(output)
+                if chunk_suite is None:
+                    parsed_ok = False
+                    break
+                suite["positive"].extend(chunk_suite.get("positive") or [])
+                suite["negative"].extend(chunk_suite.get("negative") or [])
+            if parsed_ok and (suite["positive"] or suite["negative"]):
+                return self._render_test_suite(suite)
+            logger.warning("⚠️ JSON suite parsing failed, falling back to regex post-processor")
+
+        # Fallback path: aggregate raw outputs and enforce structure via regex
+        combined = '\n\n'.join(all_outputs)
+        return self._enforce_output_structure(combined, ac_items)
+
+    def _parse_suite_json(self, output: str) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+        """
+        Parse one chunk's LLM output as a JSON test suite. Returns a dict with
+        'positive'/'negative' lists of normalized test case dicts, or None if
+        the output is not valid JSON (caller falls back to the regex parser).
+        """
+        text = output.strip()
+        try:
+            parsed = json.loads(text)
+        except (ValueError, TypeError):
+            # Model occasionally wraps the object in prose; try the outermost braces
+            start, end = text.find('{'), text.rfind('}')
+            if start == -1 or end <= start:
+                return None
             try:
-                # Use FAISS vector store for semantic search with HuggingFace embeddings
-                query = f"{description}\n{acceptance_criteria}"
+                parsed = json.loads(text[start:end + 1])
+            except (ValueError, TypeError):
+                return None
 
-                # Get relevant domain knowledge
-                domain_context = self.vector_store.get_relevant_context(
-                    query=query,
-                    max_tokens=1000
-                )
+        if not isinstance(parsed, dict):
+            return None
 
-                # Get similar test case examples
-                similar_docs = self.vector_store.similarity_search(
-                    query=f"test cases examples for {description}",
-                    k=3
-                )
+        def normalize(entry):
+            if not isinstance(entry, dict):
+                return None
+            steps = entry.get('steps') or []
+            if not isinstance(steps, list):
+                steps = [str(steps)]
+            return {
+                'ac_text': entry.get('acceptance_criteria') or entry.get('ac_text') or '',
+                'title': entry.get('title') or '',
+                'steps': [str(s).strip() for s in steps if str(s).strip()],
+                'expected': entry.get('expected_result') or entry.get('expected') or '',
+            }
 
-                domain_knowledge = domain_context if domain_context != "No relevant context found." else ""
+        suite = {}
+        for section in ('positive', 'negative'):
+            entries = parsed.get(section) or []
+            if not isinstance(entries, list):
+                return None
+            suite[section] = [n for n in (normalize(e) for e in entries) if n]
+        return suite
 
-                if similar_docs:
-                    similar_examples = "\n---\n".join([
-                        f"Example from {doc.metadata.get('filename', 'knowledge base')}:\n{doc.page_content[:500]}..."
-                        for doc in similar_docs
-                    ])
+    def _render_test_suite(self, suite: Dict[str, List[Dict[str, Any]]]) -> str:
+        """
+        Render a parsed test suite into the requested Markdown structure.
+        Mirrors the output of _enforce_output_structure so downstream
+        consumers see an identical format regardless of which path produced it.
+        """
+        def normalize_title(title, is_positive):
+            if not title:
+                return ("Verify" if is_positive else "Validate") + " scenario behaves as expected"
+            t = title.strip()
+            if is_positive and not t.lower().startswith("verify"):
+                t = "Verify " + t
+            if not is_positive and not t.lower().startswith("validate"):
+                t = "Validate " + t
+            words = t.split()
+            if len(words) > 12:
+                t = " ".join(words[:12]) + "…"
+            return t
 
-                logger.info("[AI] 🤗 Using semantic search")
+        def render_section(name):
+            buf = [f"## {name} Test Cases"]
+            is_positive = (name == "Positive")
+            entries = [e for e in suite["positive" if is_positive else "negative"]
+                       if e.get('steps') or e.get('expected')]
+            for e_idx, entry in enumerate(entries):
+                if is_positive:
+                    buf.append(f"Acceptance Criteria: {entry.get('ac_text') or ''}")
+                buf.append(f"Test case Title: {normalize_title(entry.get('title'), is_positive)}")
+                buf.append("Steps:")
+                steps = entry.get('steps') or []
+                if steps:
+                    for idx, s in enumerate(steps, 1):
+                        buf.append(f"  {idx}. {s}")
+                else:
+                    buf.append("  1. ")
+                buf.append(f"Expected Result: {entry.get('expected') or ''}")
+                if e_idx < len(entries) - 1:
+                    buf.append("")
+            return "\n".join(buf)
 
-            except Exception as e:
-                logger.error(f"❌ FAISS vector store failed: {str(e)}")
-                # In AI-only mode, we don't fallback - we fail
-                raise RuntimeError(f"AI-only mode: FAISS vector store failed: {str(e)}")
+        return f"{render_section('Positive')}\n\n{render_section('Negative')}"
 
-        ac_items = self.enumerate_criteria(acceptance_criteria)
-        criteria_list = '\n'.join([f"{i+1}. {item}" for i, item in enumerate(ac_items)])
+    def _get_markdown_llm(self):
+        """
+        Return an LLM that emits plain Markdown, for the streaming path.
 
-        # Enrich domain_knowledge and similar_examples from vector store if available
-        domain_knowledge = ""
-        similar_examples = ""
-        if use_knowledge and hasattr(self, 'vector_store') and self.vector_store:
-            try:
-                query = f"{description}\n{acceptance_criteria}"
-                domain_context = self.vector_store.get_relevant_context(query=query, max_tokens=1000)
-                similar_docs = self.vector_store.similarity_search(query=f"test cases examples for {description}", k=3)
-                domain_knowledge = domain_context if domain_context != "No relevant context found." else ""
-                if similar_docs:
-                    similar_examples = "\n---\n".join([
-                        f"Example from {doc.metadata.get('filename', 'knowledge base')}:\n{doc.page_content[:500]}..."
-                        for doc in similar_docs
-                    ])
-            except Exception as e:
-                logger.error(f"❌ FAISS vector store failed: {str(e)}")
-                raise RuntimeError(f"AI-only mode: FAISS vector store failed: {str(e)}")
+        When json_output is on, self.llm runs in Ollama's JSON mode, whose
+        output never contains the "Expected Result:" lines the streaming
+        flush heuristic keys on. Streaming therefore uses a separate
+        non-JSON instance, shared through the module-level cache; the server
+        was already verified when the JSON instance was built, so no extra
+        probe is needed.
+        """
+        if not self.json_output or self._llm_provided:
+            return self.llm
+        from langchain_ollama import OllamaLLM
 
-        all_outputs = []
+        base_url = "http://localhost:11434"
+        model = self.model_name or "llama2"
+        llm_key = (base_url, model, "")
+        llm = _LLM_INSTANCES.get(llm_key)
+        if llm is None:
+            llm_kwargs = {"model": model, "base_url": base_url, "temperature": 0.1}
+            if self.num_ctx is not None:
+                llm_kwargs["num_ctx"] = self.num_ctx
+            if self.num_batch is not None:
+                llm_kwargs["num_batch"] = self.num_batch
+            if self.num_gpu is not None:
+                llm_kwargs["num_gpu"] = self.num_gpu
+            llm = OllamaLLM(**llm_kwargs)
+            _LLM_INSTANCES[llm_key] = llm
+        return llm
+
+    def _stream_chunk(self, prompt: str, llm=None):
+        """
+        Stream tokens for one criteria chunk from the LLM, yielding text pieces
+        as they arrive instead of blocking on the full completion.
+        """
+        for token in (llm or self.llm).stream(prompt):
+            if isinstance(token, dict) and 'content' in token:
+                yield token['content']
+            else:
+                yield str(token)
+
+    def _iter_chunk_prompts(self, ac_items: List[str], domain_knowledge: str, similar_examples: str,
+                            json_output: Optional[bool] = None):
+        """
+        Yield the final prompt string for each criteria chunk. The shared
+        prefix (instructions + domain knowledge + examples) is rendered once
+        per request; only the small per-chunk suffix is re-rendered.
+        json_output overrides the instance setting when given (the streaming
+        path always wants the Markdown suffix).
+        """
+        if json_output is None:
+            json_output = self.json_output
+        if _PROMPT_PREFIX_COMPILED is not None:
+            prefix_str = _PROMPT_PREFIX_COMPILED.render(
+                domain_knowledge=domain_knowledge,
+                similar_examples=similar_examples,
+            )
+            suffix_template = _PROMPT_SUFFIX_JSON_COMPILED if json_output else _PROMPT_SUFFIX_COMPILED
+            render_suffix = suffix_template.render
+        else:
+            prefix_str = self.prompt_prefix.format(
+                domain_knowledge=domain_knowledge,
+                similar_examples=similar_examples,
+            )
+            suffix_template = self.prompt_suffix_json if json_output else self.prompt_suffix
+            render_suffix = suffix_template.format
         chunked_criteria = self._chunk_criteria(ac_items, chunk_size=5)
         start_idx = 0
         previous_criteria = []
@@ -578,38 +953,85 @@ Do not include any other fields. Keep wording grounded in the given acceptance c
             chunk_list = '\n'.join([f"{i+1+start_idx}. {item}" for i, item in enumerate(chunk)])
             # Context bridging: pass previous criteria as context
             context_bridge = '\n'.join([f"{i+1}. {item}" for i, item in enumerate(previous_criteria)]) if previous_criteria else "None"
-            prompt_input = {
-                "user_story": description,
-                "acceptance_criteria": '\n'.join(chunk),
-                "domain_knowledge": domain_knowledge,
-                "similar_examples": similar_examples,
-                "criteria_list": chunk_list,
-                "criteria_count": len(chunk),
-                "previous_criteria": context_bridge
-            }
-            prompt_str = str(prompt_input)
-            if self._prompt_length(prompt_str) > SAFE_PROMPT_TOKENS:
-                logger.info("Prompt too long, but not summarizing. Using full input.")
+            suffix_str = render_suffix(
+                criteria_list=chunk_list,
+                criteria_count=len(chunk),
+                previous_criteria=context_bridge,
+            )
+            yield prefix_str + suffix_str
+            start_idx += len(chunk)
+            previous_criteria.extend(chunk)
+
+    def _iter_chunk_outputs(self, description: str, ac_items: List[str], domain_knowledge: str, similar_examples: str):
+        """
+        Generate the LLM output for each criteria chunk, yielding one joined
+        output string per chunk. Tokens are consumed from the streaming API so
+        post-processing can overlap with generation in streaming callers.
+        """
+        llm_format = "json" if self.json_output else ""
+        model = self.model_name or "llama2"
+        for prompt in self._iter_chunk_prompts(ac_items, domain_knowledge, similar_examples):
+            cache_key = _completion_cache_key(model, llm_format, prompt)
+            cached = _completion_cache_get(cache_key)
+            if cached is not None:
+                logger.info("✅ Completion cache hit, skipping LLM call")
+                yield cached
+                continue
             # Retry logic for LLM invocation
             for attempt in range(3):
                 try:
-                    result = self.chain.invoke(prompt_input)
-                    if isinstance(result, dict) and 'content' in result:
-                        output = result['content']
-                    else:
-                        output = str(result)
-                    all_outputs.append(output)
+                    tokens = []
+                    for piece in self._stream_chunk(prompt):
+                        tokens.append(piece)
+                    output = ''.join(tokens)
+                    _completion_cache_put(cache_key, output)
+                    yield output
                     break
                 except Exception as e:
                     logger.error(f"LLM invocation failed (attempt {attempt+1}): {str(e)}")
                     if attempt == 2:
                         raise RuntimeError(f"AI-only mode: Test case generation failed after retries: {str(e)}")
-            start_idx += len(chunk)
-            previous_criteria.extend(chunk)
-        # Aggregate all outputs
-        combined = '\n\n'.join(all_outputs)
-        # Enforce structure and readability before returning
-        return self._enforce_output_structure(combined, ac_items)
+
+    def generate_test_cases_stream(self, description: str, acceptance_criteria: str, use_knowledge: bool = True):
+        """
+        Streaming variant of generate_test_cases: yields raw Markdown as test
+        case blocks complete, so callers (e.g. SSE endpoints) can forward
+        partial results while the LLM is still generating.
+
+        A block is flushed once its "Expected Result:" line has fully arrived;
+        any trailing partial text is flushed at the end of each chunk. The
+        Markdown prompt suffix and a non-JSON-mode LLM are always used here,
+        even when json_output is enabled, since JSON-mode output has no
+        per-block boundaries to flush on.
+
+        Yields:
+            str: Completed test case blocks (raw LLM Markdown)
+        """
+        if self.ai_mode != "ai":
+            error_msg = f"AI components not available. AI-only mode requires HuggingFace embeddings + Ollama LLM. Error: {self.initialization_error}"
+            logger.error(f"❌ {error_msg}")
+            raise RuntimeError(error_msg)
+        if not self.llm:
+            raise RuntimeError("Ollama LLM is not initialized. Cannot generate test cases.")
+
+        ac_items = self.enumerate_criteria(acceptance_criteria)
+        domain_knowledge, similar_examples = self._retrieve_context(description, acceptance_criteria, use_knowledge)
+
+        llm = self._get_markdown_llm()
+        for prompt in self._iter_chunk_prompts(ac_items, domain_knowledge, similar_examples, json_output=False):
+            # Rolling buffer: flush completed lines whenever an Expected Result
+            # line finishes, retaining the partial tail for the next token
+            buffer = ""
+            for piece in self._stream_chunk(prompt, llm=llm):
+                buffer += piece
+                if '\n' not in buffer:
+                    continue
+                complete, tail = buffer.rsplit('\n', 1)
+                if re.search(r"(?mi)^-?\s*expected\s*result:.*$", complete):
+                    yield complete + '\n'
+                    buffer = tail
+            if buffer.strip():
+                yield buffer
 
     def generate_test_cases_with_metadata(self, description: str, acceptance_criteria: str, use_knowledge: bool = True) -> Dict[str, Any]:
         """
@@ -7,82 +7,173 @@ This module provides functionality to store and retrieve domain knowledge using
 import os
 import json
 import logging
-import sys
+import functools
+
+# Optional fast JSON codec; fall back to the stdlib when not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 import numpy as np
-from langchain_openai import OpenAIEmbeddings
+import faiss
 from langchain_community.vectorstores import FAISS
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain.embeddings.base import Embeddings
 from langchain.schema import Document
 
 # Configure logging
 logger = logging.getLogger('ai-test-generator')
 
+# Optional numba-compiled search kernel; fall back to the FAISS path when
+# numba is not installed
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _l2sqr_earlyabort(q, xb, k):
+        """
+        Top-k L2 search that sums (q-x)^2 in 32-lane chunks and abandons a
+        candidate as soon as its partial sum exceeds the current k-th best.
+        """
+        n, d = xb.shape
+        best_dist = np.full(k, np.inf)
+        best_idx = np.full(k, -1)
+        worst = np.inf
+        for i in range(n):
+            partial = 0.0
+            j = 0
+            while j < d:
+                end = min(j + 32, d)
+                for t in range(j, end):
+                    diff = q[t] - xb[i, t]
+                    partial += diff * diff
+                if partial >= worst:
+                    break
+                j = end
+            if partial < worst:
+                w = np.argmax(best_dist)
+                best_dist[w] = partial
+                best_idx[w] = i
+                worst = best_dist.max()
+        order = np.argsort(best_dist)
+        return best_idx[order], best_dist[order]
+
+class LocalEmbeddings(Embeddings):
+    """
+    Local embeddings adapter for the knowledge base.
+
+    Runs all-MiniLM-L6-v2 on CPU via fastembed's quantized ONNX runtime when
+    available, falling back to sentence-transformers. Replaces the previous
+    OpenAI embeddings so add/search calls are compute-bound (microseconds to
+    low milliseconds) instead of paying a network round-trip per call.
+    """
+
+    def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2"):
+        self.model_name = model_name
+        try:
+            from fastembed import TextEmbedding
+            self._model = TextEmbedding(model_name)
+            self._backend = "fastembed"
+        except ImportError:
+            from sentence_transformers import SentenceTransformer
+            self._model = SentenceTransformer(model_name)
+            self._backend = "sentence-transformers"
+        logger.info(f"Initialized local embeddings ({self._backend}) with model {model_name}")
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed a list of documents in one batched forward pass"""
+        if self._backend == "fastembed":
+            return [vector.tolist() for vector in self._model.embed(texts)]
+        return self._model.encode(texts, convert_to_numpy=True).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a single query"""
+        return self.embed_documents([text])[0]
+
 class KnowledgeBase:
     """
     Class for storing and retrieving domain knowledge using vector embeddings
     """
     
-    def __init__(self, storage_dir: str = None, embedding_model: str = "text-embedding-3-small"):
+    # Embedding models are expensive to construct, so one instance per model
+    # name is shared across every KnowledgeBase in the process
+    _shared_embeddings: Dict[str, Optional[Embeddings]] = {}
+    
+    def __init__(self, storage_dir: str = None, embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"):
         """
         Initialize the knowledge base
-        
+
         Args:
             storage_dir (str): Directory to store knowledge base files
-            embedding_model (str): The OpenAI embedding model to use
+            embedding_model (str): The local embedding model to use
         """
         # Use backend/knowledge_base as default storage directory
         self.storage_dir = storage_dir or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend', 'knowledge_base')
         self.embedding_model = embedding_model
-        
-        # Debug information
-        print(f"[DEBUG] Initializing KnowledgeBase with storage_dir: {self.storage_dir}")
-        print(f"[DEBUG] Embedding model: {self.embedding_model}")
-        
+
+        logger.debug("Initializing KnowledgeBase with storage_dir: %s", self.storage_dir)
+        logger.debug("Embedding model: %s", self.embedding_model)
+
         # Create storage directory if it doesn't exist
         os.makedirs(self.storage_dir, exist_ok=True)
-        
-        # Initialize embeddings
-        try:
-            # Get API key from AWS Secrets Manager
-            try:
-                # Add project root to Python path to ensure imports work correctly
-                project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-                if project_root not in sys.path:
-                    sys.path.append(project_root)
-                
-                from src.utils.secrets_manager import SecretsManager
-                secrets_manager = SecretsManager()
-                secrets = secrets_manager.get_secret('ai-test-generator/api-keys')
-                api_key = secrets.get('OPENAI_API_KEY')
-                logger.info("Retrieved OpenAI API key from AWS Secrets Manager")
-                self.embeddings = OpenAIEmbeddings(model=embedding_model, api_key=api_key)
-            except Exception as secrets_error:
-                logger.error(f"Failed to retrieve API key from AWS Secrets Manager: {str(secrets_error)}")
-                self.embeddings = None
-                
-            logger.info(f"Initialized embeddings with model {embedding_model}")
-        except Exception as e:
-            logger.error(f"Failed to initialize embeddings: {str(e)}")
-            self.embeddings = None
-        
-        # Check embeddings initialization
-        if self.embeddings is None:
-            print("[DEBUG] Embeddings not initialized. Vector store will not be available.")
+
+        # Embeddings are constructed lazily on first use and shared across
+        # instances, so building a KnowledgeBase per request stays cheap
+        self._embeddings = None
         
         # Initialize vector store
         self.vector_store = None
         
-        # Debug information
-        print(f"[DEBUG] Vector store initialized: {self.vector_store is not None}")
-        
-        # Initialize knowledge items
+        # Initialize knowledge items, the id -> item index, and the running
+        # id counter (avoids re-reading len() on every insert)
         self.knowledge_items = []
-        
+        self._by_id = {}
+        self._counter = 0
+
+        # Query caches: exact-string LRU over query embeddings, plus a small
+        # semantic cache of recent query vectors and their formatted results
+        self._embed_query_cached = functools.lru_cache(maxsize=1024)(self._embed_query)
+        self._semantic_cache = []
+
+        # Contiguous fp32 matrix of stored vectors and their squared norms,
+        # kept in knowledge_items order for the BLAS-backed batch search path
+        self._xb = None
+        self._xb_norms = None
+
+        # Reusable query buffer for batch search, grown geometrically so
+        # steady-state batches allocate nothing
+        self._q_buf = None
+
         # Load existing knowledge base if available
         self.load()
     
-    def add_knowledge(self, content: str, source: str, metadata: Optional[Dict[str, Any]] = None) -> str:
+    @classmethod
+    def _get_embeddings(cls, model_name: str) -> Optional[Embeddings]:
+        """Get (or construct once) the shared embeddings for a model"""
+        if model_name not in cls._shared_embeddings:
+            try:
+                cls._shared_embeddings[model_name] = LocalEmbeddings(model_name)
+                logger.info(f"Initialized embeddings with model {model_name}")
+            except Exception as e:
+                logger.error(f"Failed to initialize embeddings: {str(e)}")
+                cls._shared_embeddings[model_name] = None
+        return cls._shared_embeddings[model_name]
+    
+    @property
+    def embeddings(self) -> Optional[Embeddings]:
+        """Lazily constructed embeddings; None if initialization failed"""
+        if self._embeddings is None:
+            self._embeddings = self._get_embeddings(self.embedding_model)
+        return self._embeddings
+    
+    def add_knowledge(self, content: str, source: str, metadata: Optional[Dict[str, Any]] = None,
+                      defer_save: bool = False) -> str:
         """
         Add knowledge to the knowledge base
         
@@ -90,12 +181,15 @@ class KnowledgeBase:
             content (str): Knowledge content
             source (str): Source of the knowledge
             metadata (Dict, optional): Additional metadata
+            defer_save (bool): Skip the per-insert save; the caller is
+                responsible for calling save() at the end of its batch
             
         Returns:
             str: ID of the added knowledge item
         """
         # Generate a unique ID
-        knowledge_id = f"k{len(self.knowledge_items) + 1:04d}"
+        self._counter += 1
+        knowledge_id = f"k{self._counter:04d}"
         
         # Create knowledge item
         knowledge_item = {
@@ -106,39 +200,122 @@ class KnowledgeBase:
             'metadata': metadata or {}
         }
         
-        # Add to knowledge items
+        # Add to knowledge items and keep the id index in sync
         self.knowledge_items.append(knowledge_item)
+        self._by_id[knowledge_id] = knowledge_item
         
         # Add to vector store if embeddings are available
         if self.embeddings:
             try:
-                # Create document for vector store
-                document = Document(
-                    page_content=content,
-                    metadata={
-                        'id': knowledge_id,
-                        'source': source,
-                        'added_at': knowledge_item['added_at'],
-                        **(metadata or {})
-                    }
-                )
+                doc_metadata = {
+                    'id': knowledge_id,
+                    'source': source,
+                    'added_at': knowledge_item['added_at'],
+                    **(metadata or {})
+                }
                 
-                # Add to vector store
+                # Embed once, then reuse the vector for both the FAISS store
+                # and the stored-vector matrix
+                vectors = self.embeddings.embed_documents([content])
                 if self.vector_store is None:
-                    self.vector_store = FAISS.from_documents([document], self.embeddings)
+                    self.vector_store = FAISS.from_embeddings(
+                        [(content, vectors[0])], self.embeddings, metadatas=[doc_metadata]
+                    )
                     logger.info("Created new vector store")
                 else:
-                    self.vector_store.add_documents([document])
+                    self.vector_store.add_embeddings(
+                        [(content, vectors[0])], metadatas=[doc_metadata]
+                    )
                     logger.info("Added document to existing vector store")
+                self._append_to_matrix(vectors)
             except Exception as e:
                 logger.error(f"Failed to add document to vector store: {str(e)}")
-        
-        # Save knowledge base
-        self.save()
+                # The item is already in knowledge_items but its vector never
+                # reached the matrix; drop the matrix so rows stay aligned
+                # with items and the scan paths rebuild it on next use
+                self._invalidate_matrix()
+
+        # Main store changed, so cached query results are stale
+        self._clear_query_caches()
+
+        # Save knowledge base unless the caller is batching inserts
+        if not defer_save:
+            self.save()
         
         logger.info(f"Added knowledge item {knowledge_id} from source {source}")
         return knowledge_id
     
+    def add_knowledge_bulk(self, items: List[Tuple[str, str, Optional[Dict[str, Any]]]]) -> List[str]:
+        """
+        Add multiple knowledge items in one batch
+        
+        Embeds all items in a single batched call, adds them to the vector
+        store once, and saves once at the end, instead of rewriting the JSON
+        file and re-serializing the FAISS index after every insert.
+        
+        Args:
+            items (List[Tuple]): List of (content, source, metadata) tuples
+            
+        Returns:
+            List[str]: IDs of the added knowledge items
+        """
+        if not items:
+            return []
+        
+        # One timestamp per batch; every item in the batch arrived together
+        now = datetime.now().isoformat()
+        
+        ids = []
+        documents = []
+        for content, source, metadata in items:
+            self._counter += 1
+            knowledge_id = f"k{self._counter:04d}"
+            knowledge_item = {
+                'id': knowledge_id,
+                'content': content,
+                'source': source,
+                'added_at': now,
+                'metadata': metadata or {}
+            }
+            self.knowledge_items.append(knowledge_item)
+            self._by_id[knowledge_id] = knowledge_item
+            ids.append(knowledge_id)
+            doc_metadata = {'id': knowledge_id, 'source': source, 'added_at': now}
+            if metadata:
+                doc_metadata.update(metadata)
+            documents.append(Document(page_content=content, metadata=doc_metadata))
+        
+        # Embed the whole batch once and add to the vector store in one call
+        if self.embeddings:
+            try:
+                texts = [doc.page_content for doc in documents]
+                vectors = self.embeddings.embed_documents(texts)
+                text_embeddings = list(zip(texts, vectors))
+                metadatas = [doc.metadata for doc in documents]
+                if self.vector_store is None:
+                    self.vector_store = FAISS.from_embeddings(
+                        text_embeddings, self.embeddings, metadatas=metadatas
+                    )
+                    logger.info("Created new vector store")
+                else:
+                    self.vector_store.add_embeddings(text_embeddings, metadatas=metadatas)
+                self._append_to_matrix(vectors)
+            except Exception as e:
+                logger.error(f"Failed to add documents to vector store: {str(e)}")
+                # The batch is already in knowledge_items but its vectors
+                # never reached the matrix; drop the matrix so rows stay
+                # aligned with items and the scan paths rebuild it on next use
+                self._invalidate_matrix()
+        
+        # Main store changed, so cached query results are stale
+        self._clear_query_caches()
+        
+        # Save once for the whole batch
+        self.save()
+        
+        logger.info(f"Added {len(ids)} knowledge items in bulk")
+        return ids
+    
     def get_knowledge(self, knowledge_id: str) -> Optional[Dict[str, Any]]:
         """
         Get a knowledge item by ID
@@ -149,11 +326,7 @@ class KnowledgeBase:
         Returns:
             Dict or None: Knowledge item if found, None otherwise
         """
-        for item in self.knowledge_items:
-            if item['id'] == knowledge_id:
-                return item
-        
-        return None
+        return self._by_id.get(knowledge_id)
     
     def get_all_knowledge(self) -> List[Dict[str, Any]]:
         """
@@ -164,10 +337,43 @@ class KnowledgeBase:
         """
         return self.knowledge_items
     
+    def _embed_query(self, query: str) -> Tuple[float, ...]:
+        """Embed a query, returning a hashable tuple so results can be cached"""
+        return tuple(self.embeddings.embed_query(query))
+
+    @staticmethod
+    def _prefetch_file(path: str) -> None:
+        """Ask the kernel to pull a file into the page cache ahead of use"""
+        try:
+            if os.path.exists(path) and hasattr(os, 'posix_fadvise'):
+                fd = os.open(path, os.O_RDONLY)
+                try:
+                    os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+                finally:
+                    os.close(fd)
+        except OSError as e:
+            logger.debug(f"Prefetch of {path} failed: {str(e)}")
+
+    def _clear_query_caches(self) -> None:
+        """Drop cached query results after the underlying store changes"""
+        self._embed_query_cached.cache_clear()
+        self._semantic_cache.clear()
+
+    def _invalidate_matrix(self) -> None:
+        """Drop the stored-vector matrix after a partial add failure, forcing
+        a rebuild instead of searching rows misaligned with knowledge_items"""
+        self._xb = None
+        self._xb_norms = None
+
     def search_knowledge(self, query: str, k: int = 3) -> List[Dict[str, Any]]:
         """
         Search knowledge items by semantic similarity
         
+        Repeated queries skip the embedding step via an exact-string LRU
+        cache, and near-duplicate queries (cosine >= 0.97 against a recent
+        query vector) reuse the previous results without searching the main
+        index at all.
+        
         Args:
             query (str): Query text
             k (int): Number of results to return
@@ -180,21 +386,53 @@ class KnowledgeBase:
             return self.knowledge_items[:k]
         
         try:
-            # Perform similarity search
-            results = self.vector_store.similarity_search_with_score(query, k=k)
+            query_vec = np.asarray(self._embed_query_cached(query.strip()), dtype=np.float32)
+            query_norm = np.linalg.norm(query_vec)
+            
+            # Semantic cache: reuse results from a near-identical earlier query
+            if query_norm > 0:
+                for cached_vec, cached_norm, cached_k, cached_results in self._semantic_cache:
+                    if cached_k != k:
+                        continue
+                    cosine = float(np.dot(query_vec, cached_vec)) / (query_norm * cached_norm)
+                    if cosine >= 0.97:
+                        return list(cached_results)
             
-            # Format results
             formatted_results = []
-            for doc, score in results:
-                # Find the original knowledge item by ID
-                knowledge_id = doc.metadata.get('id')
-                knowledge_item = self.get_knowledge(knowledge_id)
-                
-                if knowledge_item:
-                    formatted_results.append({
-                        **knowledge_item,
-                        'similarity_score': float(score)
-                    })
+            if (NUMBA_AVAILABLE and self._xb is not None
+                    and isinstance(self.vector_store.index, faiss.IndexFlat)):
+                # Flat index only: the early-abort brute-force kernel beats an
+                # exact flat scan, but must not replace the sub-linear HNSW
+                # path large KBs get. Rows are aligned with knowledge_items.
+                top_k = min(k, len(self.knowledge_items))
+                idxs, dists = _l2sqr_earlyabort(query_vec, self._xb, top_k)
+                for i, dist in zip(idxs, dists):
+                    if i >= 0:
+                        formatted_results.append({
+                            **self.knowledge_items[i],
+                            'similarity_score': float(dist)
+                        })
+            else:
+                # Perform similarity search with the precomputed embedding
+                results = self.vector_store.similarity_search_with_score_by_vector(
+                    query_vec.tolist(), k=k
+                )
+                for doc, score in results:
+                    # Find the original knowledge item by ID
+                    knowledge_id = doc.metadata.get('id')
+                    knowledge_item = self.get_knowledge(knowledge_id)
+                    
+                    if knowledge_item:
+                        formatted_results.append({
+                            **knowledge_item,
+                            'similarity_score': float(score)
+                        })
+            
+            # Remember this query for future semantic-cache hits
+            if query_norm > 0:
+                self._semantic_cache.append((query_vec, query_norm, k, list(formatted_results)))
+                if len(self._semantic_cache) > 64:
+                    self._semantic_cache.pop(0)
             
             return formatted_results
         
@@ -202,13 +440,96 @@ class KnowledgeBase:
             logger.error(f"Error searching knowledge: {str(e)}")
             return self.knowledge_items[:k]
     
+    def _append_to_matrix(self, vectors: List[List[float]]) -> None:
+        """Append freshly embedded vectors to the stored-vector matrix
+
+        One float32 matrix serves both the early-abort kernel and the batch
+        GEMM directly; norms are computed for the appended rows only, so
+        per-insert work scales with the batch rather than the whole store.
+        """
+        # The matrix is only valid when it already covers every older item;
+        # after load() it is None while knowledge_items holds N entries, so
+        # appending just the new rows would leave row i pointing at the wrong
+        # item. Drop it instead and let the next scan rebuild from the full
+        # items list.
+        have = 0 if self._xb is None else self._xb.shape[0]
+        if have != len(self.knowledge_items) - len(vectors):
+            self._invalidate_matrix()
+            return
+        rows = np.ascontiguousarray(np.asarray(vectors, dtype=np.float32))
+        row_norms = np.einsum('ij,ij->i', rows, rows)
+        if self._xb is None:
+            self._xb = rows
+            self._xb_norms = row_norms
+        else:
+            self._xb = np.ascontiguousarray(np.vstack((self._xb, rows)))
+            self._xb_norms = np.concatenate((self._xb_norms, row_norms))
+    
+    def search_knowledge_batch(self, queries: List[str], k: int = 3) -> List[List[Dict[str, Any]]]:
+        """
+        Search knowledge items for multiple queries in one pass
+        
+        Embeds all queries together and computes every query-to-document L2
+        distance as ||q||^2 + ||x||^2 - 2*q.x with a single BLAS matrix
+        multiply over precomputed document norms, instead of one
+        vector-by-vector search per query.
+        
+        Args:
+            queries (List[str]): Query texts
+            k (int): Number of results to return per query
+            
+        Returns:
+            List[List[Dict]]: Per-query lists of knowledge items with scores
+        """
+        if not queries:
+            return []
+        if not self.knowledge_items or not self.embeddings:
+            return [self.knowledge_items[:k] for _ in queries]
+        
+        try:
+            if self._xb is None:
+                # One-time rebuild (e.g. after loading from disk): embed all
+                # stored items in a single batched call
+                contents = [item['content'] for item in self.knowledge_items]
+                self._append_to_matrix(self.embeddings.embed_documents(contents))
+            
+            vectors = self.embeddings.embed_documents(queries)
+            dim = len(vectors[0])
+            if self._q_buf is None or self._q_buf.shape[0] < len(vectors) or self._q_buf.shape[1] != dim:
+                self._q_buf = np.empty((max(len(vectors), 16), dim), dtype=np.float32)
+            q = self._q_buf[:len(vectors)]
+            for i, vector in enumerate(vectors):
+                q[i] = vector
+            q_norms = np.einsum('ij,ij->i', q, q)
+            scores = q_norms[:, None] + self._xb_norms[None, :] - 2.0 * np.dot(q, self._xb.T)
+            
+            top_k = min(k, len(self.knowledge_items))
+            results = []
+            for row in scores:
+                order = np.argpartition(row, top_k - 1)[:top_k]
+                order = order[np.argsort(row[order])]
+                results.append([
+                    {**self.knowledge_items[i], 'similarity_score': float(row[i])}
+                    for i in order
+                ])
+            return results
+        
+        except Exception as e:
+            logger.error(f"Error in batch knowledge search: {str(e)}")
+            return [self.search_knowledge(query, k) for query in queries]
+    
     def save(self) -> None:
         """Save the knowledge base to disk"""
         try:
-            # Save knowledge items
+            # Save knowledge items (compact, no indent: indenting triples
+            # the file size and write time for zero functional benefit)
             kb_file = os.path.join(self.storage_dir, 'knowledge_base.json')
-            with open(kb_file, 'w', encoding='utf-8') as f:
-                json.dump(self.knowledge_items, f, indent=2)
+            if orjson is not None:
+                with open(kb_file, 'wb') as f:
+                    f.write(orjson.dumps(self.knowledge_items, option=orjson.OPT_APPEND_NEWLINE))
+            else:
+                with open(kb_file, 'w', encoding='utf-8') as f:
+                    json.dump(self.knowledge_items, f, separators=(',', ':'))
             
             # Save vector store if it exists
             if self.vector_store:
@@ -228,31 +549,43 @@ class KnowledgeBase:
             # Load knowledge items
             kb_file = os.path.join(self.storage_dir, 'knowledge_base.json')
             if os.path.exists(kb_file):
-                with open(kb_file, 'r', encoding='utf-8') as f:
-                    self.knowledge_items = json.load(f)
-                
+                with open(kb_file, 'rb') as f:
+                    data = f.read()
+                self.knowledge_items = orjson.loads(data) if orjson is not None else json.loads(data)
+                self._by_id = {item['id']: item for item in self.knowledge_items}
+                self._counter = len(self.knowledge_items)
+
                 logger.info(f"Loaded knowledge base with {len(self.knowledge_items)} items")
             else:
                 logger.info("No existing knowledge base found, starting with empty knowledge base")
             
-            # Load vector store if embeddings are available
-            if self.embeddings:
-                vector_store_path = os.path.join(self.storage_dir, 'vector_store')
-                if os.path.exists(vector_store_path):
+            # Load the vector store only when one exists on disk (or items
+            # need re-indexing); touching self.embeddings is what triggers
+            # the lazy model construction
+            vector_store_path = os.path.join(self.storage_dir, 'vector_store')
+            if os.path.exists(vector_store_path):
+                if self.embeddings:
                     try:
+                        # Hint the kernel to start reading the index files
+                        # ahead of the load, so load_local streams from the
+                        # page cache instead of stalling on each read
+                        self._prefetch_file(os.path.join(vector_store_path, 'index.faiss'))
+                        self._prefetch_file(os.path.join(vector_store_path, 'index.pkl'))
                         self.vector_store = FAISS.load_local(vector_store_path, self.embeddings)
                         logger.info("Loaded vector store from disk")
                     except Exception as e:
                         logger.error(f"Failed to load vector store, will recreate: {str(e)}")
                         self._recreate_vector_store()
-                else:
-                    logger.info("No existing vector store found, will create if needed")
-                    self._recreate_vector_store()
+            elif self.knowledge_items:
+                logger.info("No existing vector store found, recreating from knowledge items")
+                self._recreate_vector_store()
         
         except Exception as e:
             logger.error(f"Failed to load knowledge base: {str(e)}")
             # Start with empty knowledge base on error
             self.knowledge_items = []
+            self._by_id = {}
+            self._counter = 0
             self.vector_store = None
     
     def _recreate_vector_store(self) -> None:
@@ -266,23 +599,51 @@ class KnowledgeBase:
                 logger.info("No knowledge items to recreate vector store")
                 return
             
-            # Create documents from knowledge items
-            documents = []
-            for item in self.knowledge_items:
-                document = Document(
-                    page_content=item['content'],
-                    metadata={
-                        'id': item['id'],
-                        'source': item['source'],
-                        'added_at': item['added_at'],
-                        **(item.get('metadata', {}))
-                    }
+            # Collect texts and metadata up front so all items are embedded in
+            # a single batched forward pass instead of one pass per item
+            texts = [item['content'] for item in self.knowledge_items]
+            metadatas = [
+                {
+                    'id': item['id'],
+                    'source': item['source'],
+                    'added_at': item['added_at'],
+                    **(item.get('metadata', {}))
+                }
+                for item in self.knowledge_items
+            ]
+
+            vectors = self.embeddings.embed_documents(texts)
+            self._xb = None
+            self._xb_norms = None
+            self._append_to_matrix(vectors)
+
+            if len(texts) >= 2000:
+                # Large KB: build an HNSW graph index explicitly so queries
+                # are approximate nearest-neighbour instead of a brute-force
+                # scan over every vector
+                matrix = np.asarray(vectors, dtype=np.float32)
+                index = faiss.IndexHNSWFlat(matrix.shape[1], 32)
+                index.hnsw.efConstruction = 200
+                index.hnsw.efSearch = 64
+                index.add(matrix)
+                documents = [
+                    Document(page_content=text, metadata=metadata)
+                    for text, metadata in zip(texts, metadatas)
+                ]
+                self.vector_store = FAISS(
+                    embedding_function=self.embeddings,
+                    index=index,
+                    docstore=InMemoryDocstore(dict(enumerate(documents))),
+                    index_to_docstore_id={i: i for i in range(len(documents))}
                 )
-                documents.append(document)
-            
-            # Create vector store
-            self.vector_store = FAISS.from_documents(documents, self.embeddings)
-            logger.info(f"Recreated vector store with {len(documents)} documents")
+            else:
+                # Small KB: a flat index is fast enough and gives exact results
+                self.vector_store = FAISS.from_embeddings(
+                    list(zip(texts, vectors)),
+                    self.embeddings,
+                    metadatas=metadatas
+                )
+            logger.info(f"Recreated vector store with {len(texts)} documents")
         
         except Exception as e:
             logger.error(f"Failed to recreate vector store: {str(e)}")
@@ -6,7 +6,8 @@ This module provides functionality to ingest knowledge from text files.
 
 import os
 import logging
-from typing import List, Dict, Any, Union
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterator, List, Dict, Any, Tuple, Union
 
 from .text_connector import TextConnector
 
@@ -42,9 +43,34 @@ class KnowledgeIngestion:
             logger.error(f"Failed to ingest from source {source}: {str(e)}")
             raise
     
+    def iter_from_multiple_sources(self, sources: List[str]) -> Iterator[Tuple[str, str]]:
+        """
+        Ingest knowledge from multiple sources, one at a time
+        
+        Yields one (source, content) pair per source so callers can process
+        and discard each file instead of holding every file in memory at
+        once. Failed sources yield an "ERROR: ..." content string.
+        
+        Args:
+            sources (List[str]): List of source paths
+            
+        Yields:
+            Tuple[str, str]: (source, content) pairs
+        """
+        for source in sources:
+            try:
+                yield source, self.ingest_from_source(source)
+            except Exception as e:
+                logger.error(f"Failed to ingest from source {source}: {str(e)}")
+                yield source, f"ERROR: {str(e)}"
+    
     def ingest_from_multiple_sources(self, sources: List[str]) -> Dict[str, str]:
         """
-        Ingest knowledge from multiple sources
+        Ingest knowledge from multiple sources in parallel
+        
+        File reads release the GIL, so sources are read through a thread
+        pool to overlap their I/O latency instead of waiting on each file
+        in turn.
         
         Args:
             sources (List[str]): List of source paths
@@ -52,14 +78,22 @@ class KnowledgeIngestion:
         Returns:
             Dict[str, str]: Dictionary mapping sources to their content
         """
+        if not sources:
+            return {}
+        
         results = {}
         
-        for source in sources:
-            try:
-                content = self.ingest_from_source(source)
-                results[source] = content
-            except Exception as e:
-                logger.error(f"Failed to ingest from source {source}: {str(e)}")
-                results[source] = f"ERROR: {str(e)}"
+        with ThreadPoolExecutor(max_workers=min(32, len(sources))) as executor:
+            futures = {
+                executor.submit(self.ingest_from_source, source): source
+                for source in sources
+            }
+            for future in as_completed(futures):
+                source = futures[future]
+                try:
+                    results[source] = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to ingest from source {source}: {str(e)}")
+                    results[source] = f"ERROR: {str(e)}"
         
         return results
@@ -5,6 +5,7 @@ This module provides functionality to read and process text files.
 """
 
 import os
+import mmap
 import logging
 
 # Configure logging
@@ -33,8 +34,16 @@ class TextConnector:
             if not os.path.exists(file_path):
                 raise FileNotFoundError(f"File not found: {file_path}")
             
-            with open(file_path, 'r', encoding='utf-8') as file:
-                content = file.read()
+            # Memory-map non-empty files so the kernel streams pages in
+            # sequentially instead of materializing a second buffer copy
+            with open(file_path, 'rb') as file:
+                if os.path.getsize(file_path) == 0:
+                    content = ''
+                else:
+                    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        if hasattr(mm, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                            mm.madvise(mmap.MADV_SEQUENTIAL)
+                        content = mm[:].decode('utf-8')
             
             logger.info(f"Successfully read content from file: {file_path}")
             return content
@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 from atlassian import Confluence
 
 class ConfluenceIngestor:
@@ -64,6 +66,44 @@ class ConfluenceIngestor:
         page_content = content['body']['storage']['value']
         return page_content
     
+    def fetch_pages_by_ids(self, page_ids, max_workers=16):
+        """
+        Fetch multiple Confluence pages concurrently
+        
+        Page fetches are independent HTTP round-trips, so they are issued
+        through a thread pool (bounded at max_workers in flight) over the
+        client's keep-alive connection pool, overlapping network latency
+        instead of paying one round-trip per page in sequence.
+        
+        Args:
+            page_ids (list): IDs of the Confluence pages to fetch
+            max_workers (int): Maximum number of concurrent requests
+            
+        Returns:
+            dict: Mapping of page ID to HTML content; failed pages map to None
+        """
+        if not self.confluence:
+            raise RuntimeError("Not connected to Confluence. Call connect() first.")
+        
+        if not page_ids:
+            return {}
+        
+        results = {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(page_ids))) as executor:
+            futures = {
+                executor.submit(self.fetch_page_by_id, page_id): page_id
+                for page_id in page_ids
+            }
+            for future in as_completed(futures):
+                page_id = futures[future]
+                try:
+                    results[page_id] = future.result()
+                except Exception as e:
+                    print(f"Failed to fetch Confluence page {page_id}: {str(e)}")
+                    results[page_id] = None
+        
+        return results
+    
     def save_page_content(self, page_id, output_file):
         """
         Fetch a page and save its content to a file
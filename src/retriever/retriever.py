@@ -6,14 +6,25 @@ for semantic search and retrieval of test cases.
 """
 
 import os
+import re
 import json
+import asyncio
+import functools
 import faiss
 import numpy as np
 from typing import List, Dict, Any, Optional, Tuple
 import pickle
 import logging
+
+# Optional fast JSON codec; fall back to the stdlib when not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from langchain.embeddings import OpenAIEmbeddings
 from langchain.vectorstores import FAISS
+from langchain.docstore.in_memory import InMemoryDocstore
 from langchain.schema import Document
 
 # Import environment variable loader
@@ -25,18 +36,62 @@ from utils.env_loader import load_env_variables, check_required_env_vars
 # Configure logging
 logger = logging.getLogger('ai-test-generator')
 
+# Compiled once: captures all four test case fields in a single scan of the
+# text representation built by add_test_cases
+_TC_RE = re.compile(
+    r"Title:\s*(?P<title>.*?)\n"
+    r"(?:Description:\s*(?P<desc>.*?)\n)?"
+    r"(?:Steps:\n(?P<steps>(?:- Step.*\n?)+))?"
+    r"(?:Expected Result:\s*(?P<er>(?:.|\n)*))?"
+)
+_STEP_RE = re.compile(r"- Step \d+:\s*(.*)")
+
+def _parse_tc_content(content: str) -> Dict[str, Any]:
+    """
+    Parse a test case text representation into its four fields
+    
+    Pure function over the content string; used wherever a document
+    without the structured metadata copy must be decoded.
+    """
+    match = _TC_RE.search(content)
+    if not match:
+        return {"title": "", "description": "", "steps": [], "expected_result": ""}
+    return {
+        "title": (match['title'] or "").strip(),
+        "description": (match['desc'] or "").strip(),
+        "steps": [step.strip() for step in _STEP_RE.findall(match['steps'] or "")],
+        "expected_result": (match['er'] or "").strip(),
+    }
+
 class Retriever:
     """
     Class for creating, querying, and managing test cases in a vector store
     """
     
-    def __init__(self, vector_store_path: Optional[str] = None, embedding_model: str = "text-embedding-3-small"):
+    def __init__(self, vector_store_path: Optional[str] = None, embedding_model: str = "text-embedding-3-small",
+                 index_type: str = "IVF_PQ", ivf_pq_threshold: int = 10000, nprobe: int = 16,
+                 use_gpu: bool = False, quantize: Optional[str] = None,
+                 hot_size: int = 10000, hot_threshold: float = 0.3):
         """
         Initialize the retriever
         
         Args:
             vector_store_path (str, optional): Path to an existing vector store
             embedding_model (str): The OpenAI embedding model to use
+            index_type (str): "IVF_PQ" to build a compressed IVF-PQ index for
+                large corpora, "Flat" to always use the exact flat index
+            ivf_pq_threshold (int): Corpus size at which IVF-PQ kicks in
+            nprobe (int): Number of IVF cells probed per query
+            use_gpu (bool): Mirror the index to GPU for batched search
+                (requires faiss-gpu; ignored otherwise)
+            quantize (str, optional): "int8" to store vectors as 8-bit
+                scalar-quantized codes (cosine via normalized inner
+                product), cutting memory 4x with negligible recall loss
+            hot_size (int): Number of recently added test cases kept in a
+                small in-memory hot tier searched before the full store
+                (0 disables tiering)
+            hot_threshold (float): L2 score at or below which a full-k hot
+                hit is trusted without consulting the full store
         """
         # Load environment variables
         load_env_variables()
@@ -49,12 +104,162 @@ class Retriever:
         self.embedding_model = embedding_model
         self.embeddings = OpenAIEmbeddings(model=embedding_model)
         self.vector_store = None
+        self.index_type = index_type
+        self.ivf_pq_threshold = ivf_pq_threshold
+        self.nprobe = nprobe
+        self.use_gpu = use_gpu and hasattr(faiss, 'StandardGpuResources')
+        self._gpu_index = None
+        self._gpu_resources = None
+        self.quantize = quantize
+        
+        # Exact-string LRU over query embeddings, plus a semantic cache of
+        # recent query vectors and their formatted search results
+        self._embed_query_cached = functools.lru_cache(maxsize=10000)(self._embed_query)
+        self._query_cache = []
+        
+        # Whether the IVF index has been trained; appends after training
+        # only add vectors, never re-cluster
+        self._trained = False
+        
+        # Hot tier: a flat in-memory index over the most recent additions,
+        # consulted before the (potentially large, mmap'd) full store
+        self.hot_size = hot_size
+        self.hot_threshold = hot_threshold
+        self._hot_recent = []
+        self._hot_store = None
+        
+        # Map of test case id -> docstore key for O(1) lookup
+        self._id_index = {}
         
         # Load existing vector store if provided
         if vector_store_path and os.path.exists(vector_store_path):
             self.load(vector_store_path)
             logger.info(f"Loaded vector store from {vector_store_path}")
     
+    async def _aembed_all(self, texts: List[str], chunk_size: int = 1000) -> List[List[float]]:
+        """
+        Embed texts as concurrent chunked requests
+        
+        Chunks of texts are submitted together via aembed_documents and
+        gathered in order, overlapping the embedding API round-trips instead
+        of paying them sequentially. Concurrency is bounded to stay under the
+        API rate limits.
+        
+        Args:
+            texts (List[str]): Texts to embed
+            chunk_size (int): Number of texts per request
+            
+        Returns:
+            List[List[float]]: One embedding per text, in input order
+        """
+        semaphore = asyncio.Semaphore(5)
+        
+        async def embed_chunk(chunk: List[str]) -> List[List[float]]:
+            async with semaphore:
+                return await self.embeddings.aembed_documents(chunk)
+        
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        results = await asyncio.gather(*[embed_chunk(chunk) for chunk in chunks])
+        return [embedding for chunk_result in results for embedding in chunk_result]
+    
+    def _embed_all(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts with length-sorted batches submitted concurrently
+        
+        Sorting by length before chunking gives each request a uniform
+        token count, avoiding batches dominated by one long straggler;
+        the embeddings are un-sorted back to input order afterwards.
+        """
+        if len(texts) <= 1:
+            return asyncio.run(self._aembed_all(list(texts)))
+        
+        sorted_idx = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        sorted_embeddings = asyncio.run(self._aembed_all([texts[i] for i in sorted_idx]))
+        
+        embeddings = [None] * len(texts)
+        for position, embedding in zip(sorted_idx, sorted_embeddings):
+            embeddings[position] = embedding
+        return embeddings
+    
+    def _add_to_hot(self, texts: List[str], embeddings: List[List[float]],
+                    metadatas: List[Dict[str, Any]]) -> None:
+        """Track new additions in the hot tier, evicting the oldest batch
+        when the recency window overflows
+
+        Tiering only applies to L2 main indexes: the hot tier is a flat L2
+        store and the merge logic sorts scores ascending, so an inner-product
+        main index (e.g. int8 scalar quantization) would invert both the
+        merged ordering and the trust threshold."""
+        if self.hot_size <= 0:
+            return
+        if (self.vector_store is not None
+                and getattr(self.vector_store.index, 'metric_type', faiss.METRIC_L2) != faiss.METRIC_L2):
+            return
+
+        try:
+            self._hot_recent.extend(zip(texts, embeddings, metadatas))
+            if len(self._hot_recent) > self.hot_size:
+                # Keep only the newest window and rebuild the hot index
+                self._hot_recent = self._hot_recent[-self.hot_size:]
+                self._hot_store = None
+            
+            if self._hot_store is None:
+                self._hot_store = FAISS.from_embeddings(
+                    [(text, embedding) for text, embedding, _ in self._hot_recent],
+                    self.embeddings,
+                    metadatas=[metadata for _, _, metadata in self._hot_recent]
+                )
+            else:
+                self._hot_store.add_embeddings(list(zip(texts, embeddings)), metadatas=metadatas)
+        except Exception as e:
+            logger.warning(f"Hot tier update failed, continuing without it: {str(e)}")
+            self._hot_store = None
+            self._hot_recent = []
+    
+    def _tiered_search_with_score(self, embedding: List[float], k: int) -> List[Tuple[Document, float]]:
+        """Search the hot tier first, falling back to and merging with the
+        full store when the hot hits are too few or too weak"""
+        hot_results = self._hot_store.similarity_search_with_score_by_vector(embedding, k=k)
+        if len(hot_results) >= k and min(score for _, score in hot_results) <= self.hot_threshold:
+            return hot_results
+        
+        cold_results = self.vector_store.similarity_search_with_score_by_vector(embedding, k=k)
+        
+        # Merge by score; hot documents also live in the full store, so
+        # deduplicate on content
+        seen = set()
+        merged = []
+        for doc, score in sorted(hot_results + cold_results, key=lambda pair: pair[1]):
+            if doc.page_content in seen:
+                continue
+            seen.add(doc.page_content)
+            merged.append((doc, score))
+        return merged[:k]
+    
+    def warm_train(self, sample_texts: List[str]) -> None:
+        """
+        Train the IVF quantizer once on a representative sample
+        
+        Training wants roughly nlist * 39 vectors (per the FAISS guidance);
+        after this, add_test_cases only embeds and appends, so periodic
+        ingestion never re-clusters the index.
+        
+        Args:
+            sample_texts (List[str]): Representative texts to train on
+        """
+        if not self.vector_store or not hasattr(self.vector_store.index, 'train'):
+            logger.warning("No trainable index available for warm_train")
+            return
+        if self.vector_store.index.is_trained:
+            self._trained = True
+            return
+        
+        embeddings = self._embed_all(sample_texts)
+        matrix = np.ascontiguousarray(np.asarray(embeddings, dtype=np.float32))
+        self.vector_store.index.train(matrix)
+        self._trained = True
+        logger.info(f"Trained index on {len(sample_texts)} sample texts")
+    
     def create_from_texts(self, texts: List[str], metadatas: Optional[List[Dict[str, Any]]] = None) -> None:
         """
         Create a vector store from a list of texts
@@ -64,13 +269,65 @@ class Retriever:
             metadatas (List[Dict], optional): Metadata for each document
         """
         try:
-            documents = [
-                Document(page_content=text, metadata=meta if meta else {})
-                for text, meta in zip(texts, metadatas or [{}] * len(texts))
-            ]
+            embeddings = self._embed_all(texts)
             
-            self.vector_store = FAISS.from_documents(documents, self.embeddings)
-            logger.info(f"Created vector store with {len(texts)} documents")
+            if self.quantize == "int8":
+                # Scalar-quantized codes with cosine-as-inner-product over
+                # L2-normalized vectors: 4x smaller, near-identical recall
+                matrix = np.ascontiguousarray(np.asarray(embeddings, dtype=np.float32))
+                norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+                norms[norms == 0] = 1.0
+                matrix /= norms
+                d = matrix.shape[1]
+                index = faiss.IndexScalarQuantizer(d, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT)
+                index.train(matrix)
+                index.add(matrix)
+                self._trained = True
+                
+                documents = [
+                    Document(page_content=text, metadata=meta if meta else {})
+                    for text, meta in zip(texts, metadatas or [{}] * len(texts))
+                ]
+                self.vector_store = FAISS(
+                    embedding_function=self.embeddings,
+                    index=index,
+                    docstore=InMemoryDocstore(dict(enumerate(documents))),
+                    index_to_docstore_id={i: i for i in range(len(documents))},
+                    normalize_L2=True
+                )
+                logger.info(f"Created int8 scalar-quantized vector store with {len(texts)} documents")
+            elif self.index_type == "IVF_PQ" and len(texts) >= self.ivf_pq_threshold:
+                # Large corpus: build a trained IVF-PQ index (k-means cells,
+                # product-quantized vectors) so searches probe a handful of
+                # cells instead of scanning every vector
+                matrix = np.ascontiguousarray(np.asarray(embeddings, dtype=np.float32))
+                d = matrix.shape[1]
+                nlist = int(4 * np.sqrt(len(texts)))
+                quantizer = faiss.IndexFlatL2(d)
+                index = faiss.IndexIVFPQ(quantizer, d, nlist, d // 4, 8)
+                index.train(matrix)
+                index.add(matrix)
+                index.nprobe = self.nprobe
+                self._trained = True
+                
+                documents = [
+                    Document(page_content=text, metadata=meta if meta else {})
+                    for text, meta in zip(texts, metadatas or [{}] * len(texts))
+                ]
+                self.vector_store = FAISS(
+                    embedding_function=self.embeddings,
+                    index=index,
+                    docstore=InMemoryDocstore(dict(enumerate(documents))),
+                    index_to_docstore_id={i: i for i in range(len(documents))}
+                )
+                logger.info(f"Created IVF-PQ vector store (nlist={nlist}, nprobe={self.nprobe}) with {len(texts)} documents")
+            else:
+                self.vector_store = FAISS.from_embeddings(
+                    list(zip(texts, embeddings)),
+                    self.embeddings,
+                    metadatas=metadatas or [{}] * len(texts)
+                )
+                logger.info(f"Created vector store with {len(texts)} documents")
         except Exception as e:
             logger.error(f"Error creating vector store: {str(e)}")
             raise
@@ -100,39 +357,59 @@ class Retriever:
         metadatas = []
         
         for tc in test_cases:
-            # Create a text representation of the test case
-            text = f"Title: {tc.get('title', '')}\n"
+            # Create a text representation of the test case (joined in one
+            # pass, avoiding quadratic string reallocation on long step lists)
+            parts = [f"Title: {tc.get('title', '')}\n"]
             
             if 'description' in tc:
-                text += f"Description: {tc['description']}\n"
+                parts.append(f"Description: {tc['description']}\n")
                 
             if 'steps' in tc:
-                text += "Steps:\n"
-                for i, step in enumerate(tc['steps']):
-                    text += f"- Step {i+1}: {step}\n"
+                parts.append("Steps:\n")
+                parts.extend(f"- Step {i+1}: {step}\n" for i, step in enumerate(tc['steps']))
                     
             if 'expected_result' in tc:
-                text += f"Expected Result: {tc['expected_result']}\n"
+                parts.append(f"Expected Result: {tc['expected_result']}\n")
+            
+            text = "".join(parts)
                 
-            # Extract metadata
+            # Extract metadata, keeping the structured test case alongside so
+            # exports never have to re-parse the text representation
             metadata = {k: v for k, v in tc.items() if k not in ['title', 'description', 'steps', 'expected_result']}
+            metadata['_raw'] = json.dumps(tc)
             
             texts.append(text)
             metadatas.append(metadata)
         
-        # Create or update the vector store
+        # Create or update the vector store; embeddings are fetched with
+        # concurrent chunked requests either way
         if self.vector_store is None:
             self.create_from_texts(texts, metadatas)
+            self._rebuild_id_index()
         else:
-            # Add documents to existing vector store
-            documents = [
-                Document(page_content=text, metadata=meta)
-                for text, meta in zip(texts, metadatas)
-            ]
-            self.vector_store.add_documents(documents)
-            
+            embeddings = self._embed_all(texts)
+            added_keys = self.vector_store.add_embeddings(list(zip(texts, embeddings)), metadatas=metadatas)
+            # Index only the new documents instead of rescanning the store
+            for key, metadata in zip(added_keys, metadatas):
+                tc_id = metadata.get('id')
+                if tc_id is not None:
+                    self._id_index[tc_id] = key
+            self._add_to_hot(texts, embeddings, metadatas)
+        # Cached search results are stale once the store changes (the
+        # embedding cache stays valid; embeddings are input-only)
+        self._query_cache.clear()
         logger.info(f"Added {len(test_cases)} test cases to the vector store")
     
+    def _rebuild_id_index(self) -> None:
+        """Rebuild the id -> docstore key index from the current docstore"""
+        self._id_index = {}
+        if not self.vector_store:
+            return
+        for key, doc in self.vector_store.docstore._dict.items():
+            tc_id = doc.metadata.get('id')
+            if tc_id is not None:
+                self._id_index[tc_id] = key
+    
     def save(self, path: str) -> None:
         """
         Save the vector store to disk
@@ -145,9 +422,25 @@ class Retriever:
                 raise ValueError("Vector store has not been created yet")
                 
             # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.makedirs(path, exist_ok=True)
+            
+            # Raw faiss index plus JSON docstore: avoids pickling the whole
+            # store and lets load() memory-map the index. Keys are written as
+            # str on both sides (JSON stringifies object keys anyway), so
+            # stores built with int docstore keys survive the round trip.
+            faiss.write_index(self.vector_store.index, os.path.join(path, 'index.faiss'))
+            payload = {
+                'index_to_docstore_id': {
+                    str(i): str(key) for i, key in self.vector_store.index_to_docstore_id.items()
+                },
+                'documents': {
+                    str(key): {'page_content': doc.page_content, 'metadata': doc.metadata}
+                    for key, doc in self.vector_store.docstore._dict.items()
+                }
+            }
+            with open(os.path.join(path, 'docstore.json'), 'w', encoding='utf-8') as f:
+                json.dump(payload, f)
             
-            self.vector_store.save_local(path)
             logger.info(f"Saved vector store to {path}")
         except Exception as e:
             logger.error(f"Error saving vector store: {str(e)}")
@@ -161,12 +454,107 @@ class Retriever:
             path (str): Path to load the vector store from
         """
         try:
-            self.vector_store = FAISS.load_local(path, self.embeddings)
+            index_file = os.path.join(path, 'index.faiss')
+            docstore_file = os.path.join(path, 'docstore.json')
+            
+            if os.path.exists(index_file) and os.path.exists(docstore_file):
+                # Memory-map the index: load time is independent of index
+                # size and vectors are paged in on demand
+                index = faiss.read_index(index_file, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+                with open(docstore_file, 'r', encoding='utf-8') as f:
+                    payload = json.load(f)
+                documents = {
+                    key: Document(page_content=entry['page_content'], metadata=entry['metadata'])
+                    for key, entry in payload['documents'].items()
+                }
+                self.vector_store = FAISS(
+                    embedding_function=self.embeddings,
+                    index=index,
+                    docstore=InMemoryDocstore(documents),
+                    index_to_docstore_id={
+                        # str() also repairs older saves that kept int values
+                        int(i): str(key) for i, key in payload['index_to_docstore_id'].items()
+                    }
+                )
+            else:
+                # Older stores written by FAISS.save_local
+                self.vector_store = FAISS.load_local(path, self.embeddings)
+            
+            self._trained = getattr(self.vector_store.index, 'is_trained', True)
+            self._rebuild_id_index()
             logger.info(f"Loaded vector store from {path}")
         except Exception as e:
             logger.error(f"Error loading vector store: {str(e)}")
             raise
     
+    def _embed_query(self, query: str) -> Tuple[float, ...]:
+        """Embed a query once, returning a hashable tuple for the LRU cache"""
+        return tuple(self.embeddings.embed_query(query))
+    
+    def _maybe_clone_to_gpu(self) -> None:
+        """Mirror the current CPU index to the GPU for batched search"""
+        if not self.use_gpu or not self.vector_store:
+            return
+        try:
+            if self._gpu_resources is None:
+                self._gpu_resources = faiss.StandardGpuResources()
+            self._gpu_index = faiss.index_cpu_to_gpu(self._gpu_resources, 0, self.vector_store.index)
+            logger.info("Cloned FAISS index to GPU")
+        except Exception as e:
+            logger.warning(f"Could not clone index to GPU, staying on CPU: {str(e)}")
+            self._gpu_index = None
+    
+    def batch_similarity_search(self, queries: List[str], k: int = 5) -> List[List[Tuple[Document, float]]]:
+        """
+        Perform similarity search for a batch of queries in one index call
+        
+        All query embeddings are stacked and searched together. When a GPU
+        mirror of the index exists and the batch is large enough to amortize
+        kernel-launch overhead, the GPU index is used; small batches and
+        CPU-only installs search the CPU index.
+        
+        Args:
+            queries (List[str]): The query texts
+            k (int): Number of results to return per query
+            
+        Returns:
+            List[List[Tuple[Document, float]]]: Per-query (document, score) lists
+        """
+        try:
+            if not self.vector_store:
+                raise ValueError("Vector store has not been created yet")
+            
+            if not queries:
+                return []
+            
+            embeddings = self.embeddings.embed_documents(queries)
+            xq = np.ascontiguousarray(np.asarray(embeddings, dtype=np.float32))
+            
+            if self._gpu_index is None:
+                self._maybe_clone_to_gpu()
+            
+            # Single-digit batches lose to CPU on kernel launch overhead
+            index = self._gpu_index if (self._gpu_index is not None and len(queries) >= 8) else self.vector_store.index
+            if hasattr(index, 'nprobe'):
+                index.nprobe = self.nprobe
+            scores, indices = index.search(xq, k)
+            
+            results = []
+            for row_scores, row_indices in zip(scores, indices):
+                row = []
+                for score, idx in zip(row_scores, row_indices):
+                    if idx == -1:
+                        continue
+                    docstore_id = self.vector_store.index_to_docstore_id[idx]
+                    doc = self.vector_store.docstore.search(docstore_id)
+                    if isinstance(doc, Document):
+                        row.append((doc, float(score)))
+                results.append(row)
+            return results
+        except Exception as e:
+            logger.error(f"Error performing batch similarity search: {str(e)}")
+            raise
+    
     def similarity_search(self, query: str, k: int = 5) -> List[Document]:
         """
         Perform a similarity search
@@ -181,8 +569,13 @@ class Retriever:
         try:
             if not self.vector_store:
                 raise ValueError("Vector store has not been created yet")
-                
-            results = self.vector_store.similarity_search(query, k=k)
+            
+            if hasattr(self.vector_store.index, 'nprobe'):
+                self.vector_store.index.nprobe = self.nprobe
+            embedding = list(self._embed_query_cached(query))
+            if self._hot_store is not None:
+                return [doc for doc, _ in self._tiered_search_with_score(embedding, k)]
+            results = self.vector_store.similarity_search_by_vector(embedding, k=k)
             return results
         except Exception as e:
             logger.error(f"Error performing similarity search: {str(e)}")
@@ -202,8 +595,13 @@ class Retriever:
         try:
             if not self.vector_store:
                 raise ValueError("Vector store has not been created yet")
-                
-            results = self.vector_store.similarity_search_with_score(query, k=k)
+            
+            if hasattr(self.vector_store.index, 'nprobe'):
+                self.vector_store.index.nprobe = self.nprobe
+            embedding = list(self._embed_query_cached(query))
+            if self._hot_store is not None:
+                return self._tiered_search_with_score(embedding, k)
+            results = self.vector_store.similarity_search_with_score_by_vector(embedding, k=k)
             return results
         except Exception as e:
             logger.error(f"Error performing similarity search with score: {str(e)}")
@@ -228,17 +626,36 @@ class Retriever:
             # Combine description and acceptance criteria for better search
             query = f"{description}\n{acceptance_criteria}"
             
+            query_vec = np.asarray(self._embed_query_cached(query), dtype=np.float32)
+            query_norm = float(np.linalg.norm(query_vec))
+            
+            # Semantic cache: reuse results from a near-identical earlier query
+            if query_norm > 0:
+                for cached_vec, cached_norm, cached_k, cached_results in self._query_cache:
+                    if cached_k != k:
+                        continue
+                    cosine = float(np.dot(query_vec, cached_vec)) / (query_norm * cached_norm)
+                    if cosine > 0.95:
+                        return list(cached_results)
+            
             # Get similar documents with scores
-            results = self.vector_store.similarity_search_with_score(query, k=k)
+            results = self.vector_store.similarity_search_with_score_by_vector(query_vec.tolist(), k=k)
             
             # Format results
-            similar_test_cases = []
-            for doc, score in results:
-                similar_test_cases.append({
+            similar_test_cases = [
+                {
                     "content": doc.page_content,
                     "metadata": doc.metadata,
                     "similarity_score": score
-                })
+                }
+                for doc, score in results
+            ]
+            
+            # Remember this query for future semantic-cache hits
+            if query_norm > 0:
+                self._query_cache.append((query_vec, query_norm, k, list(similar_test_cases)))
+                if len(self._query_cache) > 64:
+                    self._query_cache.pop(0)
             
             return similar_test_cases
         except Exception as e:
@@ -259,6 +676,28 @@ class Retriever:
         """
         return self.find_similar_test_cases(description, acceptance_criteria, k=k)
     
+    def _doc_to_test_case(self, doc: Document) -> Dict[str, Any]:
+        """
+        Convert a stored document back into a test case dictionary
+        
+        Documents ingested with the structured copy in metadata['_raw'] are
+        decoded directly; older documents fall back to parsing the text
+        representation.
+        
+        Args:
+            doc (Document): The stored document
+            
+        Returns:
+            Dict: The test case dictionary
+        """
+        metadata = doc.metadata
+        raw = metadata.get('_raw')
+        if raw is not None:
+            return json.loads(raw)
+        
+        # Single compiled-regex scan instead of repeated str.split passes
+        return {**_parse_tc_content(doc.page_content), **metadata}
+    
     def export_test_cases_to_json(self, output_path: str) -> None:
         """
         Export all test cases to a JSON file
@@ -269,56 +708,20 @@ class Retriever:
         if not self.vector_store:
             raise ValueError("Vector store has not been created yet")
             
-        # Get all documents from the vector store
-        documents = self.vector_store.docstore._dict.values()
-        
-        # Convert documents to test cases
-        test_cases = []
-        for doc in documents:
-            # Parse the document content
-            content = doc.page_content
-            metadata = doc.metadata
-            
-            # Extract title
-            title = ""
-            title_match = content.split("Title:", 1)
-            if len(title_match) > 1:
-                title = title_match[1].split("\n", 1)[0].strip()
-            
-            # Extract description
-            description = ""
-            desc_match = content.split("Description:", 1)
-            if len(desc_match) > 1:
-                description = desc_match[1].split("\n", 1)[0].strip()
-            
-            # Extract steps
-            steps = []
-            steps_match = content.split("Steps:", 1)
-            if len(steps_match) > 1:
-                steps_section = steps_match[1].split("Expected Result:", 1)[0]
-                step_lines = [line.strip()[2:].strip() for line in steps_section.split("\n") if line.strip().startswith("- Step")]
-                steps = step_lines
-            
-            # Extract expected result
-            expected_result = ""
-            er_match = content.split("Expected Result:", 1)
-            if len(er_match) > 1:
-                expected_result = er_match[1].strip()
-            
-            # Create test case
-            test_case = {
-                "title": title,
-                "description": description,
-                "steps": steps,
-                "expected_result": expected_result,
-                **metadata
-            }
-            
-            test_cases.append(test_case)
+        # Convert stored documents back to test cases (a metadata read for
+        # documents carrying the structured copy, no string parsing)
+        test_cases = [
+            self._doc_to_test_case(doc)
+            for doc in self.vector_store.docstore._dict.values()
+        ]
         
         # Save to JSON file
-        with open(output_path, 'w') as f:
-            json.dump(test_cases, f, indent=2)
+        if orjson is not None:
+            with open(output_path, 'wb') as f:
+                f.write(orjson.dumps(test_cases, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_path, 'w') as f:
+                json.dump(test_cases, f, indent=2)
             
         logger.info(f"Exported {len(test_cases)} test cases to {output_path}")
     
@@ -330,8 +733,9 @@ class Retriever:
             input_path (str): Path to the JSON file
         """
         try:
-            with open(input_path, 'r') as f:
-                test_cases = json.load(f)
+            with open(input_path, 'rb') as f:
+                data = f.read()
+            test_cases = orjson.loads(data) if orjson is not None else json.loads(data)
                 
             self.add_test_cases(test_cases)
             logger.info(f"Imported {len(test_cases)} test cases from {input_path}")
@@ -352,53 +756,16 @@ class Retriever:
         if not self.vector_store:
             raise ValueError("Vector store has not been created yet")
             
-        # Get all documents from the vector store
-        documents = self.vector_store.docstore._dict.values()
+        # O(1) lookup through the id index
+        docstore_key = self._id_index.get(test_case_id)
+        if docstore_key is None:
+            return None
         
-        # Find the document with the matching ID
-        for doc in documents:
-            metadata = doc.metadata
-            if metadata.get('id') == test_case_id:
-                content = doc.page_content
-                
-                # Extract title
-                title = ""
-                title_match = content.split("Title:", 1)
-                if len(title_match) > 1:
-                    title = title_match[1].split("\n", 1)[0].strip()
-                
-                # Extract description
-                description = ""
-                desc_match = content.split("Description:", 1)
-                if len(desc_match) > 1:
-                    description = desc_match[1].split("\n", 1)[0].strip()
-                
-                # Extract steps
-                steps = []
-                steps_match = content.split("Steps:", 1)
-                if len(steps_match) > 1:
-                    steps_section = steps_match[1].split("Expected Result:", 1)[0]
-                    step_lines = [line.strip()[2:].strip() for line in steps_section.split("\n") if line.strip().startswith("- Step")]
-                    steps = step_lines
-                
-                # Extract expected result
-                expected_result = ""
-                er_match = content.split("Expected Result:", 1)
-                if len(er_match) > 1:
-                    expected_result = er_match[1].strip()
-                
-                # Create test case
-                test_case = {
-                    "title": title,
-                    "description": description,
-                    "steps": steps,
-                    "expected_result": expected_result,
-                    **metadata
-                }
-                
-                return test_case
-                
-        return None
+        doc = self.vector_store.docstore._dict.get(docstore_key)
+        if doc is None:
+            return None
+        
+        return self._doc_to_test_case(doc)
 
 
 # Example usage
@@ -1,8 +1,16 @@
 import os
+import functools
 import yaml
 import logging
 from datetime import datetime
 
+# libyaml's C loader parses 5-10x faster than the pure-Python one; fall
+# back when PyYAML was built without it
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -10,6 +18,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger('ai-test-generator')
 
+@functools.lru_cache(maxsize=32)
+def _load_config_cached(config_path, mtime):
+    """Parse a config file; cached on (path, mtime) so unchanged files
+    are parsed only once per process"""
+    with open(config_path, 'r') as file:
+        return yaml.load(file, Loader=_YamlLoader)
+
 def load_config(config_path):
     """
     Load configuration from a YAML file
@@ -25,8 +40,7 @@ def load_config(config_path):
         return {}
         
     try:
-        with open(config_path, 'r') as file:
-            config = yaml.safe_load(file)
+        config = _load_config_cached(config_path, os.path.getmtime(config_path))
         logger.info(f"Loaded configuration from {config_path}")
         return config
     except Exception as e:
@@ -12,6 +12,9 @@ from pathlib import Path
 # Configure logging
 logger = logging.getLogger('ai-test-generator')
 
+# Whether the default .env lookup has already run in this process
+_ENV_LOADED = False
+
 def load_env_variables(env_file=None):
     """
     Load environment variables from .env file
@@ -22,18 +25,26 @@ def load_env_variables(env_file=None):
     Returns:
         bool: True if environment variables were loaded successfully, False otherwise
     """
+    global _ENV_LOADED
+    
     try:
         # If env_file is provided, use it directly
         if env_file and os.path.exists(env_file):
             load_dotenv(env_file)
             logger.info(f"Loaded environment variables from {env_file}")
             return True
+        
+        # The default lookup scans the filesystem; doing it once per
+        # process is enough (constructing many Retrievers is common)
+        if _ENV_LOADED:
+            return True
             
         # Otherwise, look in default locations
         # 1. Current directory
         if os.path.exists(".env"):
             load_dotenv(".env")
             logger.info("Loaded environment variables from ./.env")
+            _ENV_LOADED = True
             return True
             
         # 2. Project root directory
@@ -42,6 +53,7 @@ def load_env_variables(env_file=None):
         if env_path.exists():
             load_dotenv(env_path)
             logger.info(f"Loaded environment variables from {env_path}")
+            _ENV_LOADED = True
             return True
             
         logger.warning("No .env file found")
@@ -53,23 +65,23 @@ def load_env_variables(env_file=None):
 def check_required_env_vars(required_vars):
     """
     Check if required environment variables are set
-    
+
+    Deliberately uncached: os.environ is mutable and a variable missing at
+    first check may be supplied later by load_env_variables(env_file=...)
+    or a direct assignment.
+
     Args:
         required_vars (list): List of required environment variable names
-        
+
     Returns:
         tuple: (bool, list) - Success status and list of missing variables
     """
-    missing_vars = []
-    
-    for var in required_vars:
-        if not os.environ.get(var):
-            missing_vars.append(var)
-            
+    missing_vars = [var for var in required_vars if not os.environ.get(var)]
+
     if missing_vars:
         logger.warning(f"Missing required environment variables: {', '.join(missing_vars)}")
         return False, missing_vars
-    
+
     return True, []
 
 # Example usage
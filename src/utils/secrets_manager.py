@@ -5,7 +5,14 @@ This module provides functionality to securely retrieve secrets from AWS Secrets
 """
 
 import json
+import functools
 import logging
+
+# Optional fast JSON codec; fall back to the stdlib when not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
 import os
 import boto3
 from botocore.exceptions import ClientError
@@ -13,6 +20,31 @@ from botocore.exceptions import ClientError
 # Configure logging
 logger = logging.getLogger('ai-test-generator')
 
+# One boto3 client per region, shared across SecretsManager instances
+# (client construction costs hundreds of milliseconds cold)
+_CLIENTS = {}
+
+def _get_client(region_name):
+    """Get (or construct once) the secretsmanager client for a region"""
+    if region_name not in _CLIENTS:
+        _CLIENTS[region_name] = boto3.client('secretsmanager', region_name=region_name)
+    return _CLIENTS[region_name]
+
+@functools.lru_cache(maxsize=64)
+def _fetch_secret(region_name, secret_name):
+    """Fetch and decode a secret; cached so repeated lookups skip the API"""
+    logger.info(f"Retrieving secret {secret_name}")
+    response = _get_client(region_name).get_secret_value(SecretId=secret_name)
+    
+    if 'SecretString' in response:
+        secret_string = response['SecretString']
+        secret_data = orjson.loads(secret_string) if orjson is not None else json.loads(secret_string)
+        logger.info(f"Successfully retrieved secret with {len(secret_data)} key(s)")
+        return secret_data
+    
+    logger.warning("Secret is binary and not supported by this utility")
+    return {}
+
 class SecretsManager:
     """
     Class for retrieving secrets from AWS Secrets Manager
@@ -26,7 +58,7 @@ class SecretsManager:
             region_name (str, optional): AWS region name. If not provided, will use AWS_REGION from environment or default to us-east-1.
         """
         self.region_name = region_name or os.environ.get('AWS_REGION', 'us-east-1')
-        self.client = boto3.client('secretsmanager', region_name=self.region_name)
+        self.client = _get_client(self.region_name)
         logger.info(f"Initialized SecretsManager with region {self.region_name}")
     
     def get_secret(self, secret_name=None):
@@ -47,16 +79,7 @@ class SecretsManager:
             raise ValueError("Secret name must be provided either as an argument or in the AWS_SECRET_NAME environment variable")
         
         try:
-            logger.info(f"Retrieving secret {secret_name}")
-            response = self.client.get_secret_value(SecretId=secret_name)
-            
-            if 'SecretString' in response:
-                secret_data = json.loads(response['SecretString'])
-                logger.info(f"Successfully retrieved secret with {len(secret_data)} key(s)")
-                return secret_data
-            else:
-                logger.warning("Secret is binary and not supported by this utility")
-                return {}
+            return _fetch_secret(self.region_name, secret_name)
                 
         except ClientError as e:
             error_code = e.response['Error']['Code']
@@ -1,7 +1,58 @@
-from flask import Flask, request, jsonify, render_template
-from flask_cors import CORS
+from flask import Flask, request, jsonify, render_template, Response, stream_with_context
+from werkzeug.exceptions import HTTPException
+import concurrent.futures
+import functools
+import hashlib
+import json
 import os
 import sys
+import threading
+
+# Optional fast JSON provider: orjson serializes responses several times
+# faster than the stdlib encoder. Flask falls back to its default provider
+# when orjson (or the Flask >= 2.2 provider API) is unavailable.
+try:
+    import orjson
+    from flask.json.provider import JSONProvider
+    
+    class ORJSONProvider(JSONProvider):
+        """Flask JSON provider backed by orjson"""
+        
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj).decode()
+        
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+except ImportError:
+    orjson = None
+    ORJSONProvider = None
+
+# Optional msgspec request decoder: parses and validates the request body
+# in one C-level pass, skipping get_json's dict build. Falls back to the
+# plain dict path when msgspec is not installed.
+try:
+    import msgspec
+    
+    class GenerateRequest(msgspec.Struct):
+        """Schema for /generate-test-cases payloads"""
+        description: str = ''
+        acceptance_criteria: str = ''
+        use_knowledge: bool = True
+        use_retrieval: bool = True
+        no_cache: bool = False
+    
+    _decode_generate_request = msgspec.json.Decoder(GenerateRequest).decode
+except ImportError:
+    msgspec = None
+    _decode_generate_request = None
+
+# Optional persistent response cache: unlike the in-process LRU below it
+# survives restarts and is shared by all gunicorn workers through the
+# cache directory. Skipped entirely when diskcache is not installed.
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
 
 # Add project root to Python path
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -11,72 +62,280 @@ if project_root not in sys.path:
 from src.generators.test_case_generator import TestCaseGenerator
 
 app = Flask(__name__)
-CORS(app)
+if ORJSONProvider is not None:
+    app.json = ORJSONProvider(app)
+
+# Static CORS stamp instead of flask-cors: the extension runs origin
+# regex matching on every request, which is wasted work for a fixed
+# allow-all policy. Three constant header writes cover the same clients.
+@app.after_request
+def _apply_cors(response):
+    headers = response.headers
+    headers['Access-Control-Allow-Origin'] = '*'
+    headers['Access-Control-Allow-Methods'] = 'GET, POST, OPTIONS'
+    headers['Access-Control-Allow-Headers'] = 'Content-Type'
+    return response
+
+@app.route('/generate-test-cases', methods=['OPTIONS'])
+@app.route('/generate-test-cases/stream', methods=['OPTIONS'])
+def _cors_preflight():
+    # Preflights never need to reach a handler; 204 + the stamped
+    # headers above is the complete answer
+    return '', 204
+
+@functools.cache
+def get_generator():
+    """Construct the test case generator once per worker, on first use
+    
+    Keeps import (and workers that only serve /health) free of model
+    loading; gunicorn.conf.py pre-warms this per worker via
+    post_worker_init so the cost never lands on a request.
+    """
+    return TestCaseGenerator()
+
+def _generate(user_story, acceptance_criteria, use_knowledge):
+    return get_generator().generate_test_cases(
+        user_story, acceptance_criteria, use_knowledge=use_knowledge
+    )
 
-# Initialize test case generator
-generator = TestCaseGenerator()
+@functools.lru_cache(maxsize=512)
+def _cached_generate(user_story, acceptance_criteria, use_knowledge, use_retrieval):
+    """Generate test cases through an LRU cache so repeated requests skip
+    the LLM and retrieval path entirely (use_retrieval participates in the
+    key so callers toggling it get distinct entries)"""
+    return _generate(user_story, acceptance_criteria, use_knowledge)
+
+_RESPONSE_CACHE_DIR = os.path.join(project_root, 'backend', 'response_cache')
+
+@functools.cache
+def _get_response_cache():
+    """Open the shared on-disk response cache, or None when unavailable"""
+    if diskcache is None:
+        return None
+    try:
+        return diskcache.Cache(_RESPONSE_CACHE_DIR, size_limit=256 << 20)
+    except Exception:
+        return None
+
+def _response_cache_key(user_story, acceptance_criteria, use_knowledge, use_retrieval):
+    """Content hash of the normalized inputs and flags"""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(user_story.strip().encode('utf-8'))
+    h.update(b'\x1e')
+    h.update(acceptance_criteria.strip().encode('utf-8'))
+    h.update(b'\x1e')
+    h.update(bytes((use_knowledge, use_retrieval)))
+    return h.hexdigest()
+
+# Single-flight map: when a burst of identical requests arrives, only the
+# first runs the LLM; the rest block on its future and share the result
+# instead of each spending a multi-second generation of their own.
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+def _single_flight_generate(key, user_story, acceptance_criteria, use_knowledge, use_retrieval):
+    """Run the cached generation, coalescing concurrent identical calls"""
+    with _inflight_lock:
+        future = _inflight.get(key)
+        if future is None:
+            future = concurrent.futures.Future()
+            _inflight[key] = future
+            leader = True
+        else:
+            leader = False
+    
+    if not leader:
+        return future.result()
+    
+    try:
+        result = _cached_generate(user_story, acceptance_criteria, use_knowledge, use_retrieval)
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
 
 @app.route('/')
 def index():
     return render_template('index.html')
 
-@app.route('/generate-test-cases', methods=['POST'])
-def generate_test_cases():
-    try:
-        # Get JSON data from request
-        data = request.get_json()
-        
+@app.errorhandler(Exception)
+def _handle_unexpected_error(e):
+    """Central handler so routes stay try-free: logs the traceback and
+    returns a generic 500 instead of leaking exception details to clients"""
+    if isinstance(e, HTTPException):
+        return e
+    app.logger.exception("Unhandled error while serving request")
+    return jsonify({"error": "Internal server error"}), 500
+
+def _parse_generate_request():
+    """Parse and validate a generation request body
+    
+    Returns:
+        Tuple of (params, error): params is (user_story, acceptance_criteria,
+        use_knowledge, use_retrieval, no_cache) on success and None otherwise;
+        error is a ready Flask response on failure and None otherwise
+    """
+    if _decode_generate_request is not None:
+        # One C-level decode+validate pass over the raw body
+        body = request.get_data(cache=False)
+        if not body:
+            return None, (jsonify({"error": "No data provided"}), 400)
+        try:
+            req = _decode_generate_request(body)
+        except (msgspec.ValidationError, msgspec.DecodeError) as e:
+            return None, (jsonify({"error": str(e)}), 400)
+        params = (req.description, req.acceptance_criteria,
+                  req.use_knowledge, req.use_retrieval, req.no_cache)
+    else:
+        # Decode the raw body directly: skips get_json's content-type
+        # inspection and caching copy, and orjson parses several times
+        # faster than the stdlib decoder when available
+        body = request.get_data(cache=False)
+        if not body:
+            return None, (jsonify({"error": "No data provided"}), 400)
+        try:
+            data = orjson.loads(body) if orjson is not None else json.loads(body)
+        except ValueError:
+            return None, (jsonify({"error": "Invalid JSON"}), 400)
         if not data:
-            return jsonify({"error": "No data provided"}), 400
-        
-        # Extract parameters
-        user_story = data.get('description', '')
-        acceptance_criteria = data.get('acceptance_criteria', '')
-        use_knowledge = data.get('use_knowledge', True)
-        use_retrieval = data.get('use_retrieval', True)
-        
-        if not user_story or not acceptance_criteria:
-            return jsonify({"error": "User story and acceptance criteria are required"}), 400
-        
-        # Generate test cases
-        test_cases = generator.generate_test_cases(
-            user_story=user_story,
-            acceptance_criteria=acceptance_criteria,
-            use_knowledge=use_knowledge,
-            use_retrieval=use_retrieval
-        )
+            return None, (jsonify({"error": "No data provided"}), 400)
         
-        return jsonify({
-            "success": True,
-            "test_cases": test_cases
-        })
+        # Extract parameters with one bound lookup of data.get
+        get = data.get
+        params = (get('description', ''), get('acceptance_criteria', ''),
+                  get('use_knowledge', True), get('use_retrieval', True),
+                  bool(get('no_cache')))
+    
+    if not params[0] or not params[1]:
+        return None, (jsonify({"error": "User story and acceptance criteria are required"}), 400)
+    
+    return params, None
+
+@app.route('/generate-test-cases', methods=['POST'])
+def generate_test_cases():
+    # Validation uses plain returns and failures fall through to the
+    # central error handler, keeping the happy path free of exception
+    # handling setup
+    params, error = _parse_generate_request()
+    if error is not None:
+        return error
+    user_story, acceptance_criteria, use_knowledge, use_retrieval, no_cache = params
+    
+    # Generate test cases (cached unless the caller opts out). The
+    # persistent cache is consulted first: one indexed point read
+    # replaces a multi-second LLM invocation, and hits survive
+    # restarts and are shared across workers.
+    cached = False
+    if no_cache:
+        test_cases = _generate(user_story, acceptance_criteria, use_knowledge)
+    else:
+        disk_cache = _get_response_cache()
+        test_cases = None
+        key = _response_cache_key(user_story, acceptance_criteria,
+                                  use_knowledge, use_retrieval)
+        if disk_cache is not None:
+            test_cases = disk_cache.get(key)
+            cached = test_cases is not None
+        if test_cases is None:
+            test_cases = _single_flight_generate(
+                key, user_story, acceptance_criteria, use_knowledge, use_retrieval)
+            if disk_cache is not None:
+                disk_cache.set(key, test_cases)
     
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    return jsonify({
+        "success": True,
+        "test_cases": test_cases,
+        "cached": cached
+    })
+
+@app.route('/generate-test-cases/stream', methods=['POST'])
+def generate_test_cases_streaming():
+    """Stream test cases as NDJSON, one object per completed block
+    
+    The first bytes go out as soon as the LLM finishes the first test
+    case instead of after the whole list, so clients can render
+    progressively while generation and transmission overlap.
+    """
+    params, error = _parse_generate_request()
+    if error is not None:
+        return error
+    user_story, acceptance_criteria, use_knowledge, _, _ = params
+    generator = get_generator()
+    
+    def gen():
+        dumps = orjson.dumps if orjson is not None else \
+            (lambda obj: json.dumps(obj).encode('utf-8'))
+        for block in generator.generate_test_cases_stream(
+                user_story, acceptance_criteria, use_knowledge=use_knowledge):
+            yield dumps({"test_case": block}) + b'\n'
+    
+    return Response(stream_with_context(gen()), mimetype='application/x-ndjson')
+
+@app.route('/cache/stats', methods=['GET'])
+def cache_stats():
+    """Expose generation cache hit/miss counters"""
+    info = _cached_generate.cache_info()
+    return jsonify({
+        "hits": info.hits,
+        "misses": info.misses,
+        "maxsize": info.maxsize,
+        "currsize": info.currsize
+    })
+
+@app.route('/cache/clear', methods=['POST'])
+def cache_clear():
+    """Clear the generation caches (in-memory and on-disk)"""
+    _cached_generate.cache_clear()
+    disk_cache = _get_response_cache()
+    if disk_cache is not None:
+        disk_cache.clear()
+    return jsonify({"success": True})
+
+# /health is polled every few seconds per pod, so its two possible
+# payloads are serialized once at import and served as prebuilt Response
+# objects: the handler does one cheap bool check and no per-call dict
+# build or JSON encoding.
+def _health_response(message):
+    payload = {"status": "healthy", "message": message, "version": "1.0.0"}
+    body = orjson.dumps(payload) if orjson is not None else json.dumps(payload)
+    return Response(body, mimetype='application/json')
+
+_HEALTH_READY_RESP = _health_response(
+    "API is running and test case generator is initialized")
+_HEALTH_LAZY_RESP = _health_response(
+    "API is running; test case generator initializes on first use")
 
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint for API integration testing"""
-    try:
-        # Check if the test case generator is initialized
-        if generator:
-            return jsonify({
-                "status": "healthy",
-                "message": "API is running and test case generator is initialized",
-                "version": "1.0.0"
-            })
-        else:
-            return jsonify({
-                "status": "degraded",
-                "message": "API is running but test case generator is not initialized",
-                "version": "1.0.0"
-            }), 500
-    except Exception as e:
-        return jsonify({
-            "status": "unhealthy",
-            "message": f"API health check failed: {str(e)}",
-            "version": "1.0.0"
-        }), 500
+    # Report without forcing generator construction, so /health stays
+    # lightweight in workers that never serve generation
+    if get_generator.cache_info().currsize > 0:
+        return _HEALTH_READY_RESP
+    return _HEALTH_LAZY_RESP
+
+# Under gunicorn's preload_app the master sets PRELOAD_WARMUP so the
+# generator is constructed here, pre-fork: its embedding weights and
+# FAISS index land in pages all workers then share copy-on-write (the
+# hot vector tables are numpy arrays, so refcount traffic doesn't
+# un-share them the way Python dict entries would).
+if os.getenv('PRELOAD_WARMUP') == '1':
+    get_generator()
+
+# ASGI entry point: lets an async server multiplex many in-flight requests
+# over a small worker pool while handlers wait on the LLM. Run with:
+#   uvicorn src.web.app:asgi_app --workers 4
+try:
+    from asgiref.wsgi import WsgiToAsgi
+    asgi_app = WsgiToAsgi(app)
+except ImportError:
+    asgi_app = None
 
 if __name__ == '__main__':
-    app.run(debug=True, port=5002)
+    # Debug (reloader + per-request debug middleware) only when asked for;
+    # production runs under gunicorn -c gunicorn.conf.py src.web.app:app
+    app.run(debug=os.getenv('FLASK_DEBUG') == '1', port=5002)
@@ -0,0 +1,117 @@
+"""
+Falcon ASGI entry point for the test case generation API
+
+A thin async port of the two hot routes: Falcon's C-accelerated router
+and an async server remove the per-request WSGI overhead, while the
+blocking generator call runs in a thread so the event loop keeps
+serving health probes and cache hits. Shares the caches, request
+schema, and single-flight map with the Flask app so both entry points
+behave identically.
+
+Run with:
+    uvicorn src.web.asgi_app:app --workers 4 --loop uvloop --http httptools
+"""
+import asyncio
+import json
+
+import falcon
+import falcon.asgi
+
+from src.web.app import (
+    msgspec,
+    orjson,
+    _decode_generate_request,
+    _generate,
+    _get_response_cache,
+    _response_cache_key,
+    _single_flight_generate,
+)
+
+if orjson is not None:
+    _dumps = orjson.dumps
+else:
+    def _dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+
+
+class HealthResource:
+    """Static health payload, serialized once"""
+
+    _body = _dumps({
+        "status": "healthy",
+        "message": "API is running",
+        "version": "1.0.0"
+    })
+
+    async def on_get(self, req, resp):
+        resp.content_type = falcon.MEDIA_JSON
+        resp.data = self._body
+
+
+class GenerateResource:
+    """POST /generate-test-cases, backed by the shared generation caches"""
+
+    async def on_post(self, req, resp):
+        body = await req.stream.read()
+        if not body:
+            raise falcon.HTTPBadRequest(description="No data provided")
+
+        if _decode_generate_request is not None:
+            try:
+                parsed = _decode_generate_request(body)
+            except (msgspec.ValidationError, msgspec.DecodeError) as e:
+                raise falcon.HTTPBadRequest(description=str(e))
+            user_story = parsed.description
+            acceptance_criteria = parsed.acceptance_criteria
+            use_knowledge = parsed.use_knowledge
+            use_retrieval = parsed.use_retrieval
+            no_cache = parsed.no_cache
+        else:
+            try:
+                data = (orjson.loads(body) if orjson is not None
+                        else json.loads(body))
+            except ValueError as e:
+                raise falcon.HTTPBadRequest(description=str(e))
+            get = data.get
+            user_story = get('description', '')
+            acceptance_criteria = get('acceptance_criteria', '')
+            use_knowledge = get('use_knowledge', True)
+            use_retrieval = get('use_retrieval', True)
+            no_cache = bool(get('no_cache'))
+
+        if not user_story or not acceptance_criteria:
+            raise falcon.HTTPBadRequest(
+                description="User story and acceptance criteria are required")
+
+        # The generator call blocks for seconds; run it off the event loop
+        # so this worker keeps multiplexing other requests meanwhile
+        cached = False
+        if no_cache:
+            test_cases = await asyncio.to_thread(
+                _generate, user_story, acceptance_criteria, use_knowledge)
+        else:
+            disk_cache = _get_response_cache()
+            key = _response_cache_key(user_story, acceptance_criteria,
+                                      use_knowledge, use_retrieval)
+            test_cases = None
+            if disk_cache is not None:
+                test_cases = disk_cache.get(key)
+                cached = test_cases is not None
+            if test_cases is None:
+                test_cases = await asyncio.to_thread(
+                    _single_flight_generate, key, user_story,
+                    acceptance_criteria, use_knowledge, use_retrieval)
+                if disk_cache is not None:
+                    disk_cache.set(key, test_cases)
+
+        resp.content_type = falcon.MEDIA_JSON
+        resp.data = _dumps({
+            "success": True,
+            "test_cases": test_cases,
+            "cached": cached
+        })
+
+
+app = falcon.asgi.App()
+app.add_route('/health', HealthResource())
+app.add_route('/generate-test-cases', GenerateResource())